@@ -0,0 +1,176 @@
+"""
+PC側のベンチマーク。build.build / build.build_multi と、書き換えの各段の時間を測り、
+生成物の大きさ（バイト数・行数・関数の数・Hub のヒープ量の目安）を表示する。Hub には送らない。
+
+- 実際の run01〜run06: build.build（run ごと）、build_multi（キャッシュなし／キャッシュあり）
+- 合成 run（実際の run を複製して --runs 個）: build_multi（キャッシュなし）
+- 書き換えの各段: parse / HubTransformer / fold_settings / unparse / node_line_map（全ソースの合計）と、
+  生成物全体に対する eliminate_dead_code / minify_source / compile / artifact_metrics
+
+build_budgets.json があれば実際の run の生成物と比べ、上限を超えていれば終了コード 1 で終わる。
+
+使い方:
+    python bench/bench_build.py
+    python bench/bench_build.py --runs 60 --repeat 5
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import build  # noqa: E402
+from bench.synthetic import make_synthetic_runs, real_run_dirs  # noqa: E402
+from metrics import (  # noqa: E402
+    BUDGETS_FILE,
+    artifact_metrics,
+    check_budgets,
+    load_budgets,
+    print_block_metrics,
+    print_metrics,
+)
+from minify import minify_source  # noqa: E402
+from optimize import eliminate_dead_code, fold_settings  # noqa: E402
+from sourcemap import node_line_map  # noqa: E402
+
+
+def best_ms(func: Callable[[], object], repeat: int) -> float:
+    """func を repeat 回実行し、最短時間（ms）を返す。func の print は捨てる。"""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            timer = time.perf_counter()
+            func()
+            best = min(best, (time.perf_counter() - timer) * 1000)
+    return best
+
+
+def source_texts(run_dirs: List[Path]) -> List[str]:
+    """run ごとの m*.py・main.py・setup.py の中身（書き換えの各段の入力）。"""
+    texts = []
+    for run_dir in run_dirs:
+        for path in build.find_mission_files(run_dir) + [run_dir / "main.py", run_dir / "setup.py"]:
+            if path.exists():
+                texts.append(build.load_text(path))
+    return texts
+
+
+def time_passes(texts: List[str], repeat: int) -> Dict[str, float]:
+    """transform_source の各段を順に実行し、全ソースについて合計した時間（ms、各段 repeat 回の最短）を返す。"""
+    stages = ("parse", "HubTransformer", "fold_settings", "unparse", "node_line_map")
+    totals = dict.fromkeys(stages, 0.0)
+    for text in texts:
+        best = dict.fromkeys(stages, float("inf"))
+        for _ in range(repeat):
+            marks = [time.perf_counter()]
+            tree = ast.parse(text)
+            marks.append(time.perf_counter())
+            tree = build.HubTransformer([]).visit(tree)
+            marks.append(time.perf_counter())
+            fold_settings(tree)
+            marks.append(time.perf_counter())
+            code = ast.unparse(tree)
+            marks.append(time.perf_counter())
+            node_line_map(tree, code)
+            marks.append(time.perf_counter())
+            for index, stage in enumerate(stages):
+                best[stage] = min(best[stage], (marks[index + 1] - marks[index]) * 1000)
+        for stage in stages:
+            totals[stage] += best[stage]
+    return totals
+
+
+def time_artifact_passes(code: str, repeat: int) -> Dict[str, float]:
+    """生成物全体に対する最終段の時間（ms）を返す。"""
+    reduced = eliminate_dead_code(code)[0]
+    return {
+        "eliminate_dead_code": best_ms(lambda: eliminate_dead_code(code), repeat),
+        "minify_source": best_ms(lambda: minify_source(reduced), repeat),
+        "compile": best_ms(lambda: compile(reduced, "hub_main.py", "exec"), repeat),
+        "artifact_metrics": best_ms(lambda: artifact_metrics(reduced), repeat),
+    }
+
+
+def print_times(title: str, times: Dict[str, float]) -> None:
+    print(title)
+    for name, value in times.items():
+        print(f"  {name:<28} {value:>9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark build.py and report artifact size / heap estimates")
+    parser.add_argument("--runs", type=int, default=60, help="synthetic run count for the scaled build (default: 60)")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per measurement (best is reported)")
+    parser.add_argument(
+        "--budgets",
+        default=BUDGETS_FILE,
+        help=f"size budget file to check the real artifact against (default: {BUDGETS_FILE}, skipped if missing)",
+    )
+    args = parser.parse_args()
+
+    run_dirs = real_run_dirs()
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        output = tmp_path / "hub_main.py"
+
+        builds: Dict[str, float] = {}
+        for run_dir in run_dirs:
+            builds[f"build {run_dir.name}"] = best_ms(lambda: build.build(run_dir, output), args.repeat)
+        builds["build_multi (no cache)"] = best_ms(
+            lambda: build.build_multi(run_dirs, output, cache=build.BuildCache()), args.repeat
+        )
+        warm = build.BuildCache(tmp_path / "cache")
+        best_ms(lambda: build.build_multi(run_dirs, output, cache=warm), 1)
+        builds["build_multi (cached)"] = best_ms(lambda: build.build_multi(run_dirs, output, cache=warm), args.repeat)
+        builds["build_multi --minify"] = best_ms(
+            lambda: build.build_multi(run_dirs, output, cache=warm, minify=True), args.repeat
+        )
+
+        with tempfile.TemporaryDirectory() as synthetic_tmp:
+            synthetic_dirs = make_synthetic_runs(Path(synthetic_tmp), args.runs)
+            synthetic_output = Path(synthetic_tmp) / "hub_main.py"
+            builds[f"build_multi {args.runs} runs"] = best_ms(
+                lambda: build.build_multi(synthetic_dirs, synthetic_output, cache=build.BuildCache()), args.repeat
+            )
+            synthetic_metrics = artifact_metrics(build.load_text(synthetic_output))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            build.build_multi(run_dirs, output, cache=warm, keep_dead_code=True)
+        stitched = build.load_text(output)
+        with contextlib.redirect_stdout(io.StringIO()):
+            build.build_multi(run_dirs, output, cache=warm)
+        real_metrics = artifact_metrics(build.load_text(output))
+
+    print_times(f"Builds (best of {args.repeat}):", builds)
+    passes = time_passes(source_texts(run_dirs), args.repeat)
+    print_times(f"Rewrite passes, {len(run_dirs)} runs (sum over source files):", passes)
+    print_times("Final passes on the stitched artifact:", time_artifact_passes(stitched, args.repeat))
+
+    print(f"Real runs ({len(run_dirs)}):")
+    print_metrics(real_metrics)
+    print_block_metrics(real_metrics)
+    print(f"Synthetic runs ({args.runs}):")
+    print_metrics(synthetic_metrics)
+
+    budgets = load_budgets(ROOT / args.budgets)
+    if budgets is None:
+        print(f"Budgets: {args.budgets} not found, skipped")
+        return
+    violations = check_budgets(real_metrics, budgets)
+    if violations:
+        for violation in violations:
+            print(f"Over budget: {violation}")
+        raise SystemExit(1)
+    print(f"Budgets: within {args.budgets}")
+
+
+if __name__ == "__main__":
+    main()
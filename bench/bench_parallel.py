@@ -0,0 +1,61 @@
+"""
+PC側のベンチマーク。build_multi の run ブロック生成を、順番に作る場合（--jobs 1）と
+プロセスプールで並列に作る場合で比べる。Hub には送らない。
+
+実際の run01〜run06 を複製した合成 run（run01〜runNN）を一時ディレクトリに作り、
+キャッシュなしで build_multi を実行した時間を run 数ごとに表示する。
+
+使い方:
+    python bench/bench_parallel.py
+    python bench/bench_parallel.py --runs 6 12 24 60 --repeat 3
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import build  # noqa: E402
+from bench.synthetic import make_synthetic_runs  # noqa: E402
+
+
+def time_build(run_dirs: List[Path], output: Path, jobs: Optional[int], repeat: int) -> float:
+    """キャッシュなしの build_multi を repeat 回実行し、最短時間（ms）を返す。"""
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            timer = time.perf_counter()
+            build.build_multi(run_dirs, output, cache=build.BuildCache(), jobs=jobs)
+            best = min(best, (time.perf_counter() - timer) * 1000)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serial vs parallel run-block generation")
+    parser.add_argument("--runs", type=int, nargs="+", default=[6, 12, 24, 60], help="synthetic run counts")
+    parser.add_argument("--repeat", type=int, default=3, help="repetitions per measurement (best is reported)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="processes for the parallel build")
+    args = parser.parse_args()
+
+    print(f"CPU count: {os.cpu_count()}, parallel jobs: {args.jobs}")
+    print(f"{'runs':>5} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+    for count in args.runs:
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            run_dirs = make_synthetic_runs(tmp_path, count)
+            output = tmp_path / "hub_main.py"
+            serial = time_build(run_dirs, output, jobs=1, repeat=args.repeat)
+            parallel = time_build(run_dirs, output, jobs=args.jobs, repeat=args.repeat)
+        print(f"{count:>5} {serial:>10.1f} {parallel:>12.1f} {serial / parallel:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+ベンチマーク用の合成 run。実際の run01〜run06 を複製して、大きな入力を作る。
+"""
+
+import shutil
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def real_run_dirs() -> List[Path]:
+    """リポジトリにある runXX ディレクトリ（名前順）。"""
+    return sorted(p for p in ROOT.glob("run*") if p.is_dir() and p.name[3:].isdigit())
+
+
+def make_synthetic_runs(dest: Path, count: int) -> List[Path]:
+    """実際の runXX を順に複製して count 個の run ディレクトリを作る。"""
+    sources = real_run_dirs()
+    run_dirs = []
+    for index in range(count):
+        run_dir = dest / f"run{index + 1:02d}"
+        shutil.copytree(sources[index % len(sources)], run_dir, ignore=shutil.ignore_patterns("__pycache__"))
+        run_dirs.append(run_dir)
+    return run_dirs
@@ -11,89 +11,399 @@ Hub 側では import なしで動作するコードを生成する。
 
 import argparse
 import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
 import re
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from metrics import (
+    BUDGETS_FILE,
+    BudgetExceeded,
+    artifact_metrics,
+    check_budgets,
+    load_budgets,
+    modules_metrics,
+    print_block_metrics,
+    print_metrics,
+)
+from minify import minify_source, report_size, strip_docstrings
+from optimize import drop_unused_imports, eliminate_dead_code, fold_settings, print_dead_code_report, used_names
+from sourcemap import (
+    SOURCE_MAP_SUFFIX,
+    MappedText,
+    follow_line_numbers,
+    follow_rewrite,
+    node_line_map,
+    source_map_path,
+    write_source_map,
+)
+from watch import watch_runs
+
+
+BUILD_CACHE_DIR = ".build_cache"
+MPY_CACHE_SUBDIR = "mpy"
+# --layout modules の出力先と、共有 setup・メニューのモジュール名
+MODULES_DIR = "hub_modules"
+SETUP_MODULE = "robotlib"
+MENU_MODULE = "hub_main"
+# setup.py の軽いリセット関数。メニューは run の間でハードウェアを作り直さずにこれを呼ぶ
+RESET_FUNCTION = "reset_robot"
+# 作り直す run がこの数未満なら、プロセスプールを使わずに順に生成する（プールの起動の方が高くつく）
+PARALLEL_MIN_RUNS = 8
 
 
 def load_text(path: Path) -> str:
     return path.read_text(encoding="utf-8")
 
 
-def strip_main_guard(text: str) -> str:
-    """__main__ ブロックを除去する。"""
-    lines = text.splitlines()
-    out: List[str] = []
-    skipping = False
-    guard_indent = 0
+def find_mission_files(run_dir: Path) -> List[Path]:
+    """run ディレクトリ内の mission ファイル (m*.py / M*.py) を名前順で返す。"""
+    return [
+        path
+        for path in sorted(run_dir.glob("[mM]*.py"))
+        if path.name != "main.py" and re.match(r"[mM]\d", path.stem)
+    ]
 
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('if __name__ == "__main__"') or stripped.startswith("if __name__ == '__main__'"):
-            skipping = True
-            guard_indent = len(line) - len(line.lstrip())
-            continue
 
-        if skipping:
-            if not line.strip():
-                continue
-            current_indent = len(line) - len(line.lstrip())
-            if current_indent <= guard_indent:
-                skipping = False
-            else:
-                continue
+def is_main_guard(node: ast.stmt) -> bool:
+    """`if __name__ == "__main__":` かどうかを判定する。"""
+    if not isinstance(node, ast.If) or not isinstance(node.test, ast.Compare):
+        return False
+    test = node.test
+    return (
+        isinstance(test.left, ast.Name)
+        and test.left.id == "__name__"
+        and len(test.ops) == 1
+        and isinstance(test.ops[0], ast.Eq)
+        and len(test.comparators) == 1
+        and isinstance(test.comparators[0], ast.Constant)
+        and test.comparators[0].value == "__main__"
+    )
+
 
-        if not skipping:
-            out.append(line)
+def is_setup_import(node: ast.stmt) -> bool:
+    """`import setup` / `from setup import ...` かどうかを判定する。"""
+    if isinstance(node, ast.Import):
+        return any(alias.name == "setup" for alias in node.names)
+    if isinstance(node, ast.ImportFrom):
+        return node.module == "setup" and not node.level
+    return False
 
-    return "\n".join(out)
 
+class HubTransformer(ast.NodeTransformer):
+    """
+    1 ファイル分の AST を Hub 用に書き換えつつ、公開シンボルと global 名を集める。
+
+    - __main__ ブロックの除去
+    - setup import の除去と `setup.xxx` → `xxx` の置き換え
+    - mission import (`import mXX as alias`) → `alias = mXX`
+    - ビルドから外した mission (dropped_missions) の import を除去
+    - variant.stop_logging の参照を globals() 経由に置き換え
+    """
+
+    def __init__(self, mission_names: Sequence[str] = (), dropped_missions: Sequence[str] = ()):
+        self.mission_names = set(mission_names)
+        self.dropped_missions = set(dropped_missions)
+        self.bound_names: List[str] = []
+        self.exports: List[str] = []
+        self.global_names: List[str] = []
+        self.line_map: Dict[int, int] = {}
+
+    def visit_Module(self, node: ast.Module) -> ast.Module:
+        node.body = [stmt for stmt in node.body if not is_main_guard(stmt)]
+        self.generic_visit(node)
+        for stmt in node.body:
+            self._collect_bound(stmt)
+        return node
+
+    def _collect_bound(self, stmt: ast.stmt) -> None:
+        found: List[str] = []
+        exported = True
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            found.append(stmt.name)
+        elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            found.extend(alias.asname or alias.name.split(".")[0] for alias in stmt.names)
+            exported = False
+        elif isinstance(stmt, ast.Assign):
+            found.extend(target.id for target in stmt.targets if isinstance(target, ast.Name))
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+            found.append(stmt.target.id)
+        for name in found:
+            if name not in self.bound_names:
+                self.bound_names.append(name)
+            if exported and not name.startswith("_") and name not in self.exports:
+                self.exports.append(name)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        super().generic_visit(node)
+        # 文を取り除いた結果ブロックが空になった場合は pass を補う
+        body = getattr(node, "body", None)
+        if isinstance(body, list) and not body and not isinstance(node, ast.Module):
+            node.body = [ast.Pass()]
+        return node
+
+    def visit_Import(self, node: ast.Import):
+        if is_setup_import(node):
+            return None
+        if len(node.names) == 1:
+            alias = node.names[0]
+            mission = alias.name.rsplit(".", 1)[-1]
+            if mission in self.dropped_missions:
+                return None
+            if mission in self.mission_names and alias.asname:
+                return self._alias_assign(alias.asname, mission, node)
+        return node
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if is_setup_import(node):
+            return None
+        if len(node.names) == 1:
+            alias = node.names[0]
+            if alias.name in self.dropped_missions:
+                return None
+            if alias.name in self.mission_names and alias.asname:
+                return self._alias_assign(alias.asname, alias.name, node)
+        return node
+
+    @staticmethod
+    def _alias_assign(alias: str, mission: str, node: ast.stmt) -> ast.Assign:
+        assign = ast.Assign(
+            targets=[ast.Name(id=alias, ctx=ast.Store())],
+            value=ast.Name(id=mission, ctx=ast.Load()),
+        )
+        return ast.copy_location(assign, node)
+
+    def visit_Global(self, node: ast.Global) -> ast.Global:
+        for name in node.names:
+            if name not in self.global_names:
+                self.global_names.append(name)
+        return node
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.value, ast.Name) and node.value.id == "setup":
+            return ast.copy_location(ast.Name(id=node.attr, ctx=node.ctx), node)
+        if (
+            isinstance(node.value, ast.Name)
+            and node.value.id == "variant"
+            and node.attr == "stop_logging"
+            and isinstance(node.ctx, ast.Store)
+        ):
+            return ast.copy_location(
+                ast.Subscript(value=globals_call(), slice=ast.Constant("stop_logging"), ctx=ast.Store()),
+                node,
+            )
+        return node
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        if (
+            isinstance(node.func, ast.Name)
+            and node.func.id == "hasattr"
+            and len(node.args) == 2
+            and isinstance(node.args[0], ast.Name)
+            and node.args[0].id == "variant"
+            and isinstance(node.args[1], ast.Constant)
+            and node.args[1].value == "stop_logging"
+        ):
+            return ast.copy_location(
+                ast.Compare(left=ast.Constant("stop_logging"), ops=[ast.In()], comparators=[globals_call()]),
+                node,
+            )
+        return node
+
+
+def globals_call() -> ast.Call:
+    return ast.Call(func=ast.Name(id="globals", ctx=ast.Load()), args=[], keywords=[])
+
+
+def apply_single_mission_override(tree: ast.Module, mission_name: str) -> None:
+    """ACTIVE_VARIANT / VARIANTS を指定 mission だけに固定する（AST を直接書き換える）。"""
+    alias = f"_variant_{mission_name}"
+    has_import = any(
+        isinstance(stmt, ast.Import)
+        and any(item.name == mission_name and item.asname == alias for item in stmt.names)
+        for stmt in tree.body
+    )
+    if not has_import:
+        insert_at = 0
+        for idx, stmt in enumerate(tree.body):
+            if isinstance(stmt, ast.ImportFrom) and (stmt.module or "").startswith("pybricks.tools"):
+                insert_at = idx + 1
+                break
+        tree.body.insert(insert_at, ast.Import(names=[ast.alias(name=mission_name, asname=alias)]))
 
-def drop_setup_imports(text: str) -> str:
-    """mission / main から setup import を削除する。"""
-    cleaned = []
-    for line in text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("import setup") or stripped.startswith("from setup import"):
+    for stmt in tree.body:
+        if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+            continue
+        target = stmt.targets[0]
+        if not isinstance(target, ast.Name):
             continue
-        cleaned.append(line)
-    return "\n".join(cleaned)
-
-
-def collect_exports(source: str) -> List[str]:
-    """mission ファイルで公開されているシンボル名を抽出する。"""
-    names = set()
-    tree = ast.parse(source)
-    for node in tree.body:
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
-            names.add(node.name)
-        elif isinstance(node, ast.Assign):
-            for target in node.targets:
+        if target.id == "ACTIVE_VARIANT":
+            stmt.value = ast.Constant(mission_name)
+        elif target.id == "VARIANTS":
+            stmt.value = ast.Dict(keys=[ast.Constant(mission_name)], values=[ast.Name(id=alias, ctx=ast.Load())])
+
+
+def literal_assignments(tree: ast.Module) -> Dict[str, ast.expr]:
+    """モジュール直下の `NAME = <式>` を名前 → 式で返す（同名は後勝ち）。"""
+    values: Dict[str, ast.expr] = {}
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Assign):
+            for target in stmt.targets:
                 if isinstance(target, ast.Name):
-                    names.add(target.id)
-        elif isinstance(node, ast.AnnAssign):
-            if isinstance(node.target, ast.Name):
-                names.add(node.target.id)
-    return sorted(name for name in names if not name.startswith("_"))
+                    values[target.id] = stmt.value
+    return values
 
 
-def collect_global_names(source: str) -> List[str]:
-    """global 文で参照されているシンボル名を抽出する。"""
-    names = set()
-    tree = ast.parse(source)
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Global):
-            names.update(node.names)
-    return sorted(names)
+def resolve_active_variant(run_dir: Path, mission_files: Sequence[Path]) -> Optional[Tuple[str, str]]:
+    """
+    main.py の get_active_variant_name() と同じ規則で、採用される variant を静的に求める。
+    CURRENT_MISSION → IS_CURRENT（VARIANTS の順）→ ACTIVE_VARIANT の順に判定し、
+    (VARIANTS のキー, mission 名) を返す。定数で決まらない場合は None。
+    """
+    tree = ast.parse(load_text(run_dir / "main.py"))
+    aliases: Dict[str, str] = {}
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Import):
+            for alias in stmt.names:
+                aliases[alias.asname or alias.name] = alias.name.rsplit(".", 1)[-1]
+        elif isinstance(stmt, ast.ImportFrom):
+            for alias in stmt.names:
+                aliases[alias.asname or alias.name] = alias.name
+
+    values = literal_assignments(tree)
+    variants_node = values.get("VARIANTS")
+    if not isinstance(variants_node, ast.Dict):
+        return None
+    variants: List[Tuple[str, str]] = []
+    for key, value in zip(variants_node.keys, variants_node.values):
+        if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+            return None
+        if not (isinstance(value, ast.Name) and value.id in aliases):
+            return None
+        variants.append((key.value, aliases[value.id]))
+    mapping = dict(variants)
+
+    def constant(name: str):
+        node = values.get(name)
+        if node is None:
+            return None
+        try:
+            return ast.literal_eval(node)
+        except ValueError:
+            raise LookupError(name)
+
+    known = {path.stem: path for path in mission_files}
+    try:
+        current = constant("CURRENT_MISSION")
+        if isinstance(current, str) and current in mapping:
+            return current, mapping[current]
+        for key, mission in variants:
+            if mission not in known:
+                return None
+            flags = literal_assignments(ast.parse(load_text(known[mission])))
+            if "IS_CURRENT" in flags and ast.literal_eval(flags["IS_CURRENT"]):
+                return key, mission
+        active = constant("ACTIVE_VARIANT")
+    except (LookupError, ValueError):
+        return None
+    if isinstance(active, str) and active in mapping:
+        return active, mapping[active]
+    return None
 
 
-def rewrite_mission(path: Path) -> tuple[str, List[str], List[str]]:
-    """mission ファイルを Hub 用に整形し、公開シンボル一覧を返す。"""
-    text = load_text(path)
-    text = drop_setup_imports(strip_main_guard(text))
-    exports = collect_exports(text)
-    global_names = collect_global_names(text)
-    return text, exports, global_names
+def prune_variants(tree: ast.Module, variant_key: str) -> None:
+    """VARIANTS を採用 variant だけに絞り、ACTIVE_VARIANT もそのキーに固定する。"""
+    for stmt in tree.body:
+        if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+            continue
+        target = stmt.targets[0]
+        if not isinstance(target, ast.Name):
+            continue
+        if target.id == "ACTIVE_VARIANT":
+            stmt.value = ast.Constant(variant_key)
+        elif target.id == "VARIANTS" and isinstance(stmt.value, ast.Dict):
+            kept = [
+                (key, value)
+                for key, value in zip(stmt.value.keys, stmt.value.values)
+                if isinstance(key, ast.Constant) and key.value == variant_key
+            ]
+            stmt.value.keys = [key for key, _ in kept]
+            stmt.value.values = [value for _, value in kept]
+
+
+def select_missions(
+    run_dir: Path,
+    mission_files: List[Path],
+    keep_variants: bool = False,
+    mission_override: Optional[str] = None,
+) -> Tuple[List[Path], Optional[str]]:
+    """
+    ビルドに含める mission ファイルと、main.py で残す VARIANTS のキーを返す。
+    keep_variants=True なら従来どおり全 mission を含める（キーは None）。
+    """
+    if keep_variants:
+        return mission_files, None
+    if mission_override:
+        selected = [path for path in mission_files if path.stem == mission_override]
+        return selected or mission_files, None
+    resolved = resolve_active_variant(run_dir, mission_files)
+    if resolved is None:
+        print(f"  {run_dir.name}: active variant could not be resolved statically; keeping all variants")
+        return mission_files, None
+    variant_key, mission = resolved
+    selected = [path for path in mission_files if path.stem == mission]
+    dropped = [path.stem for path in mission_files if path.stem != mission]
+    if dropped:
+        print(f"  {run_dir.name}: active variant {mission} (dropped: {', '.join(dropped)})")
+    return selected, variant_key
+
+
+def transform_source(
+    text: str,
+    mission_names: Sequence[str] = (),
+    mission_override: Optional[str] = None,
+    variant_key: Optional[str] = None,
+    dropped_missions: Sequence[str] = (),
+) -> Tuple[str, HubTransformer]:
+    """
+    1 ファイルを 1 回だけ parse し、書き換え結果と収集情報（HubTransformer）を返す。
+    リテラルの設定 dict の `**` 展開は定数キーワード引数に畳み込む（optimize.fold_settings）。
+    書き換え後の行 -> 元ファイルの行 の対応は transformer.line_map に入れる。
+    """
+    tree = ast.parse(text)
+    if mission_override:
+        apply_single_mission_override(tree, mission_override)
+    if variant_key is not None:
+        prune_variants(tree, variant_key)
+    transformer = HubTransformer(mission_names, dropped_missions)
+    tree = transformer.visit(tree)
+    fold_settings(tree)
+    code = ast.unparse(tree)
+    transformer.line_map = node_line_map(tree, code)
+    return code, transformer
+
+
+def rewrite_mission(path: Path) -> tuple[str, List[str], List[str], Dict[int, int]]:
+    """mission ファイルを Hub 用に整形し、公開シンボル一覧と行の対応を返す。"""
+    text, info = transform_source(load_text(path))
+    return text, sorted(info.exports), sorted(info.global_names), info.line_map
+
+
+def rewrite_setup(text: str) -> tuple[str, List[str], Dict[int, int]]:
+    """setup.py を Hub 用に整形し、モジュール直下の束縛名（定義順）と行の対応を返す。"""
+    text, info = transform_source(text)
+    return text, info.bound_names, info.line_map
 
 
 def mission_binding(mission_name: str, exports: Iterable[str], global_names: Iterable[str]) -> str:
@@ -115,66 +425,22 @@ def mission_binding(mission_name: str, exports: Iterable[str], global_names: Ite
     return "\n".join(lines)
 
 
-def apply_single_mission_override(main_text: str, mission_name: str) -> str:
-    alias = f"_variant_{mission_name}"
-    import_pattern = rf"^\s*import\s+{re.escape(mission_name)}\s+as\s+{re.escape(alias)}\s*$"
-    if not re.search(import_pattern, main_text, flags=re.M):
-        lines = main_text.splitlines()
-        insert_at = 0
-        for idx, line in enumerate(lines):
-            if line.startswith("from pybricks.tools"):
-                insert_at = idx + 1
-                break
-        lines.insert(insert_at, f"import {mission_name} as {alias}  # auto-selected mission")
-        main_text = "\n".join(lines)
-
-    main_text = re.sub(
-        r'^(?P<indent>\s*)ACTIVE_VARIANT\s*=\s*["\'][^"\']*["\']\s*$',
-        rf'\g<indent>ACTIVE_VARIANT = "{mission_name}"',
-        main_text,
-        flags=re.M,
-    )
-    main_text = re.sub(
-        r"^(?P<indent>\s*)VARIANTS\s*=\s*{.*}$",
-        rf'\g<indent>VARIANTS = {{"{mission_name}": {alias}}}',
+def rewrite_main(
+    main_text: str,
+    mission_names: List[str],
+    mission_override: Optional[str] = None,
+    variant_key: Optional[str] = None,
+    dropped_missions: Sequence[str] = (),
+) -> Tuple[str, Dict[int, int]]:
+    """main.py の import をファイル内参照に書き換え（外した mission の import は消す）、行の対応と一緒に返す。"""
+    rewritten, info = transform_source(
         main_text,
-        flags=re.M,
+        mission_names,
+        mission_override=mission_override,
+        variant_key=variant_key,
+        dropped_missions=dropped_missions,
     )
-    return main_text
-
-
-def rewrite_main(main_text: str, mission_names: List[str], mission_override: Optional[str] = None) -> str:
-    """main.py の import をファイル内参照に書き換える。"""
-    main_text = drop_setup_imports(strip_main_guard(main_text))
-    if mission_override:
-        main_text = apply_single_mission_override(main_text, mission_override)
-    lines: List[str] = []
-    for line in main_text.splitlines():
-        stripped = line.strip()
-        handled = False
-        for mission in mission_names:
-            pattern_import = rf"^(?P<indent>\s*)import\s+(?P<prefix>[\w.]*\.)?{mission}\s+as\s+(?P<alias>[\w_]+)"
-            pattern_from = rf"^(?P<indent>\s*)from\s+[\w.]*\s+import\s+{mission}\s+as\s+(?P<alias>[\w_]+)"
-
-            for pattern in (pattern_import, pattern_from):
-                match = re.match(pattern, line)
-                if match:
-                    indent = match.group("indent")
-                    alias = match.group("alias")
-                    lines.append(f"{indent}{alias} = {mission}")
-                    handled = True
-                    break
-            if handled:
-                break
-
-        if not handled:
-            lines.append(line)
-
-    rewritten = "\n".join(lines)
-    rewritten = rewritten.replace("setup.", "")
-    rewritten = rewritten.replace('hasattr(variant, "stop_logging")', '"stop_logging" in globals()')
-    rewritten = rewritten.replace("variant.stop_logging = True", 'globals()["stop_logging"] = True')
-    return rewritten
+    return rewritten, info.line_map
 
 
 def normalize_run_arg(run_arg: str) -> str:
@@ -199,14 +465,145 @@ def indent_text(text: str, spaces: int) -> str:
     return "\n".join(prefix + line if line else "" for line in text.splitlines())
 
 
-def build_single_run_block(run_dir: Path) -> str:
-    """runXX ディレクトリを 1 つのファクトリ関数にまとめたコードを返す。"""
-    mission_files = [
-        path
-        for path in sorted(run_dir.glob("[mM]*.py"))
-        if path.name != "main.py" and re.match(r"[mM]\d", path.stem)
-    ]
-    if not mission_files:
+def source_name(path: Path) -> str:
+    """ソースマップに書く元ファイル名（runXX/mYY.py のようにリポジトリ直下からの相対パス）。"""
+    return f"{path.parent.name}/{path.name}"
+
+
+def setup_digest(setup_text: str) -> str:
+    """setup.py の内容から共有判定用の短いハッシュを返す。"""
+    return hashlib.sha1(setup_text.encode("utf-8")).hexdigest()[:10]
+
+
+BUILD_MODULES = ("optimize.py", "sourcemap.py", "minify.py")
+
+
+def build_version() -> str:
+    """
+    build.py と、生成コードや行の対応を作る BUILD_MODULES の内容ハッシュ。
+    ビルド処理が変わればキャッシュは自動で無効になる。
+    """
+    digest = hashlib.sha1()
+    here = Path(__file__)
+    for path in (here,) + tuple(here.with_name(name) for name in BUILD_MODULES):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def run_cache_key(run_dir: Path, options: str = "") -> str:
+    """
+    run ディレクトリの m*.py / main.py / setup.py とビルド処理（build_version）の内容から run ブロックのキーを作る。
+    options には生成結果が変わるビルドオプション（--keep-variants など）を文字列で渡す。
+    """
+    digest = hashlib.sha1()
+    digest.update(build_version().encode("ascii"))
+    digest.update(run_dir.name.encode("utf-8"))
+    digest.update(options.encode("utf-8"))
+    sources = find_mission_files(run_dir) + [run_dir / "main.py", run_dir / "setup.py"]
+    for path in sources:
+        if not path.exists():
+            continue
+        digest.update(b"\0" + path.name.encode("utf-8") + b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """
+    生成済みのブロックを cache_dir に JSON で保存し、キーが一致すれば再利用する。
+    cache_dir が None の場合はディスクに保存しない（同じプロセス内の再ビルド、--watch のときだけ再利用する）。
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = cache_dir
+        self.memory: Dict[str, dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, name: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{name}.json"
+
+    def get(self, name: str, key: str) -> Optional[dict]:
+        path = self._path(name)
+        entry = self.memory.get(name)
+        if entry is not None and entry.get("key") == key:
+            self.hits += 1
+            return entry
+        entry = None
+        if path is not None and path.exists():
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                entry = None
+        if entry is not None and entry.get("key") == key:
+            self.memory[name] = entry
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, name: str, key: str, **data) -> None:
+        entry = dict(data, key=key)
+        self.memory[name] = entry
+        path = self._path(name)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        except OSError as exc:
+            print(f"Warning: build cache not written ({exc})")
+
+    def report(self, elapsed_ms: float) -> None:
+        print(f"Build cache: {self.hits} hit(s), {self.misses} miss(es)")
+        print(f"Build time: {elapsed_ms:.1f} ms")
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+def format_name_tuple(names: Sequence[str], spaces: int) -> str:
+    prefix = " " * spaces
+    return "\n".join(["("] + [f"{prefix}    {name}," for name in names] + [f"{prefix})"])
+
+
+def build_setup_block(
+    setup_ref: str, setup_text: str, names: Sequence[str], source: str, line_map: Dict[int, int]
+) -> MappedText:
+    """
+    setup.py をモジュール直下に 1 回だけ展開するコードを返す。
+    定義は _make_<setup_ref>() の中で 1 度だけ実行し、束縛名をタプルで保持する。
+    source / line_map は setup 部分の行の対応（ソースマップ用）。
+    """
+    block = MappedText()
+    block.add(f"def _make{setup_ref}():")
+    block.add("    # Auto-generated shared setup")
+    block.add(indent_text(setup_text, 4), source, line_map)
+    block.add(f"    return {format_name_tuple(names, 4)}")
+    block.add("")
+    block.add("")
+    block.add(f"{setup_ref} = _make{setup_ref}()")
+    return block
+
+
+def build_single_run_block(
+    run_dir: Path,
+    shared_setup: Optional[Tuple[str, List[str]]] = None,
+    keep_variants: bool = False,
+    as_module: bool = False,
+) -> MappedText:
+    """
+    runXX ディレクトリを 1 つのファクトリ関数にまとめたコードを、元ファイルの行の対応と一緒に返す。
+    shared_setup (参照名, 束縛名一覧) を渡すと setup.py を埋め込まず、共有 setup から名前を取り出す。
+    keep_variants=False なら採用 variant の mission だけを含める。
+    as_module=True なら関数で包まず、Hub 上の 1 モジュール（runXX.py）として書く。
+    このとき shared_setup の参照名はモジュール名（robotlib）で、そこから import する。
+    """
+    all_mission_files = find_mission_files(run_dir)
+    if not all_mission_files:
         raise FileNotFoundError(f"No mission file (m*.py) found in {run_dir}")
 
     setup_path = run_dir / "setup.py"
@@ -214,94 +611,342 @@ def build_single_run_block(run_dir: Path) -> str:
     if not main_path.exists():
         raise FileNotFoundError(f"main.py not found in {run_dir}")
 
+    mission_files, variant_key = select_missions(run_dir, all_mission_files, keep_variants=keep_variants)
+    dropped = [path.stem for path in all_mission_files if path not in mission_files]
+
     mission_names: List[str] = []
     all_global_names = set()
-    parts: List[str] = [f"def _make_{run_dir.name}():", f"    # Auto-generated from {run_dir.name}"]
+    if as_module:
+        spaces = 0
+        parts = MappedText(
+            [
+                f"# Auto-generated from {run_dir.name}. Do not edit this file on Hub.",
+                "from pybricks.tools import multitask, wait",
+            ]
+        )
+    else:
+        spaces = 4
+        parts = MappedText([f"def _make_{run_dir.name}():", f"    # Auto-generated from {run_dir.name}"])
+    pad = " " * spaces
 
     for mission_path in mission_files:
         mission_name = mission_path.stem
         mission_names.append(mission_name)
-        mission_text, exports, global_names = rewrite_mission(mission_path)
+        mission_text, exports, global_names, line_map = rewrite_mission(mission_path)
         all_global_names.update(global_names)
-        parts.append(f"    # ---- mission: {mission_name} ----")
-        parts.append(indent_text(mission_text, 4))
-        parts.append(indent_text(mission_binding(mission_name, exports, global_names), 4))
+        parts.add(f"{pad}# ---- mission: {mission_name} ----")
+        parts.add(indent_text(mission_text, spaces), source_name(mission_path), line_map)
+        parts.add(indent_text(mission_binding(mission_name, exports, global_names), spaces))
+
+    if all_global_names and not as_module:
+        parts.insert_line(2, f"    global {', '.join(sorted(all_global_names))}")
+
+    setup_names: Sequence[str] = ()
+    if shared_setup is not None:
+        setup_ref, setup_names = shared_setup
+        parts.add(f"{pad}# ---- setup (shared: {setup_ref}) ----")
+        if as_module:
+            parts.add(f"from {setup_ref} import {format_name_tuple(setup_names, 0)}")
+        else:
+            parts.add(f"    {format_name_tuple(setup_names, 4)} = {setup_ref}")
+    elif setup_path.exists():
+        parts.add(f"{pad}# ---- setup ----")
+        setup_code, setup_names, line_map = rewrite_setup(load_text(setup_path))
+        parts.add(indent_text(setup_code, spaces), source_name(setup_path), line_map)
+
+    parts.add(f"{pad}# ---- main ----")
+    main_text = load_text(main_path)
+    main_code, line_map = rewrite_main(main_text, mission_names, variant_key=variant_key, dropped_missions=dropped)
+    parts.add(indent_text(main_code, spaces), source_name(main_path), line_map)
+    parts.add(f"{pad}# ---- run entry ----")
+    parts.add(
+        indent_text(
+            """
+async def _run_entry(ctx):
+    variant = load_variant()
+    has_stop_logging = "stop_logging" in globals()
+    if has_stop_logging:
+        # メニューは bundle を使い回すので、前の run で立てた停止フラグを戻しておく
+        globals()["stop_logging"] = False
+    async def timed_run():
+        await run(ctx.hub, ctx.robot, ctx.left_wheel, ctx.right_wheel, ctx.left_lift, ctx.right_lift)
+    if hasattr(variant, "sensor_logger_task"):
+        if has_stop_logging:
+            async def wrapped_run():
+                await timed_run()
+                globals()["stop_logging"] = True
+                await wait(500)
+            await multitask(variant.sensor_logger_task(ctx.hub, ctx.robot, ctx.left_wheel, ctx.right_wheel), wrapped_run())
+        else:
+            await multitask(variant.sensor_logger_task(ctx.hub, ctx.robot, ctx.left_wheel, ctx.right_wheel), timed_run())
+    else:
+        await timed_run()
+""".strip(),
+            spaces,
+        )
+    )
+    if not as_module:
+        # 2 回目以降の run はメニューが reset_robot で軽くリセットする（古い setup.py にはないので、あるときだけ渡す）
+        reset_ref = RESET_FUNCTION if RESET_FUNCTION in setup_names else "None"
+        parts.add(f"    return RunBundle(initialize_robot, _run_entry, {reset_ref})")
+    return parts
 
-    if all_global_names:
-        parts.insert(2, f"    global {', '.join(sorted(all_global_names))}")
 
-    if setup_path.exists():
-        parts.append("    # ---- setup ----")
-        parts.append(indent_text(load_text(setup_path), 4))
+RunBlockTask = Tuple[Path, Optional[Tuple[str, List[str]]], bool, bool]
 
-    parts.append("    # ---- main ----")
-    main_text = load_text(main_path)
-    parts.append(indent_text(rewrite_main(main_text, mission_names), 4))
-    parts.append("    # ---- run entry ----")
-    parts.append("    async def _run_entry(ctx):")
-    parts.append("        variant = load_variant()")
-    parts.append("        has_stop_logging = \"stop_logging\" in globals()")
-    parts.append("        async def timed_run():")
-    parts.append(
-        "            await run(ctx.hub, ctx.robot, ctx.left_wheel, ctx.right_wheel, ctx.left_lift, ctx.right_lift)"
-    )
-    parts.append("        if hasattr(variant, \"sensor_logger_task\"):")
-    parts.append("            if has_stop_logging:")
-    parts.append("                async def wrapped_run():")
-    parts.append("                    await timed_run()")
-    parts.append("                    globals()[\"stop_logging\"] = True")
-    parts.append("                    await wait(500)")
-    parts.append(
-        "                await multitask(variant.sensor_logger_task(ctx.hub, ctx.robot, ctx.left_wheel, ctx.right_wheel), wrapped_run())"
-    )
-    parts.append("            else:")
-    parts.append(
-        "                await multitask(variant.sensor_logger_task(ctx.hub, ctx.robot, ctx.left_wheel, ctx.right_wheel), timed_run())"
-    )
-    parts.append("        else:")
-    parts.append("            await timed_run()")
-    parts.append("    return RunBundle(initialize_robot, _run_entry)")
-    return "\n".join(parts)
 
+def build_run_block_task(task: RunBlockTask) -> Tuple[dict, str]:
+    """
+    1 run 分の build_single_run_block。プロセスプールからも呼べるようにモジュール直下に置く。
+    途中の print 出力は集めて返し、呼び出し側が run の順に表示する。
+    """
+    run_dir, shared_setup, keep_variants, as_module = task
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        code = build_single_run_block(
+            run_dir, shared_setup=shared_setup, keep_variants=keep_variants, as_module=as_module
+        )
+    return code.to_json(), printed.getvalue()
 
-def build_multi(run_dirs: Sequence[Path], output: Path) -> None:
-    """複数 run を 1 ファイルにまとめ、Hub のメニューで切り替える hub_main.py を生成する。"""
-    if not run_dirs:
-        raise FileNotFoundError("No run directories found.")
 
-    run_dirs = sorted(run_dirs, key=lambda p: p.name)
-    header = [
-        "# Auto-generated menu hub_main.py. Do not edit this file on Hub.",
-        "# Select run on Hub; no PC-side RUN selection required.",
-        "from pybricks.hubs import PrimeHub",
-        "from pybricks.parameters import Button, Port",
-        "from pybricks.pupdevices import ForceSensor",
-        "from pybricks.tools import multitask, run_task, wait",
-        "",
-        "_HUB = None",
-        "_TOUCH = None",
-        "_LAST_CONTEXT = None",
-        "STORAGE_OFFSET = 0",
-        "STORAGE_LEN = 1",
-        "RUN_MIN = 1",
-    ]
+def build_run_blocks(tasks: Sequence[RunBlockTask], jobs: Optional[int] = None) -> List[Tuple[dict, str]]:
+    """
+    run ブロックをまとめて生成し、tasks と同じ順で返す。
+    jobs=None なら CPU 数のプロセスを使うが、tasks が PARALLEL_MIN_RUNS 未満ならこのプロセスで順に作る。
+    jobs=1 なら常に順に作る。
+    """
+    workers = jobs or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1 or (jobs is None and len(tasks) < PARALLEL_MIN_RUNS):
+        return [build_run_block_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return list(pool.map(build_run_block_task, tasks))
 
-    body: List[str] = []
-    factory_entries: List[str] = []
-    for idx, run_dir in enumerate(run_dirs, start=1):
-        run_name = run_dir.name
-        factory_entries.append(f"    \"{idx}\": _make_{run_name}")
-        body.append("")
-        body.append(build_single_run_block(run_dir))
 
-    max_run = len(run_dirs)
-    menu_line = f"RUN_MAX = {max_run}"
-    body.append("")
-    body.append(menu_line)
-    body.append("")
-    body.append("RUNNERS = {\n" + ",\n".join(factory_entries) + "\n}")
-    body.append(
-        """
+def finish_output(code: MappedText, minify: bool = False, keep_dead_code: bool = False) -> MappedText:
+    """
+    書き出す直前の最終段。行の対応（ソースマップ）は書き換えに合わせて引き継ぐ。
+    keep_dead_code=False なら到達できない関数・メソッドを取り除いて一覧を表示する。
+    minify=True なら minify してサイズを表示する。
+    """
+    text = code.text + "\n"
+    origins = code.origins
+    if not keep_dead_code:
+        reduced, removed, numbers = eliminate_dead_code(text)
+        print_dead_code_report(removed)
+        origins = follow_line_numbers(origins, numbers)
+        text = reduced
+    if minify:
+        minified = minify_source(text)
+        report_size(text, minified)
+        line_map = node_line_map(strip_docstrings(ast.parse(text)), minified)
+        origins = follow_rewrite(origins, line_map, len(minified.splitlines()))
+        text = minified
+    return MappedText(text.splitlines(), origins)
+
+
+def eliminate_module_dead_code(
+    modules: Sequence[Tuple[str, MappedText]], run_setups: Dict[str, Tuple[str, List[str]]]
+) -> List[Tuple[str, MappedText]]:
+    """
+    --layout modules での到達できないコードの削除（finish_output の eliminate_dead_code をモジュールごとに行う）。
+    run モジュールは、メニューが属性として使う名前（_run_entry, initialize_robot など）から到達できるものだけを残し、
+    共有 setup からの import を使う名前だけにする。共有 setup（robotlib_<hash>）は、それを使う run が
+    import する名前と使う属性名から到達できるものだけを残す。メニューはそのまま。
+    """
+    menu = dict(modules)[MENU_MODULE]
+    _, menu_attrs = used_names(menu.text)
+    setup_refs = {setup_ref for setup_ref, _ in run_setups.values()}
+    setup_roots: Dict[str, Set[str]] = {setup_ref: set() for setup_ref in setup_refs}
+    setup_attrs: Dict[str, Set[str]] = {setup_ref: set(menu_attrs) for setup_ref in setup_refs}
+    reduced: Dict[str, MappedText] = {}
+    report: Dict[str, List[str]] = {}
+    for name, code in modules:
+        if name == MENU_MODULE or name in setup_refs:
+            continue
+        text, removed, numbers = eliminate_dead_code(code.text + "\n", attrs=menu_attrs, label=name)
+        origins = follow_line_numbers(code.origins, numbers)
+        if name in run_setups:
+            setup_ref = run_setups[name][0]
+            text, imported, numbers = drop_unused_imports(text, setup_ref, keep=menu_attrs)
+            origins = follow_line_numbers(origins, numbers)
+            setup_roots[setup_ref].update(imported)
+            setup_attrs[setup_ref].update(used_names(text)[1])
+        report.update(removed)
+        reduced[name] = MappedText(text.splitlines(), origins)
+    for name, code in modules:
+        if name not in setup_refs:
+            continue
+        text, removed, numbers = eliminate_dead_code(
+            code.text + "\n", roots=setup_roots[name], attrs=setup_attrs[name], label=name
+        )
+        report.update(removed)
+        reduced[name] = MappedText(text.splitlines(), follow_line_numbers(code.origins, numbers))
+    print_dead_code_report(report)
+    return [(name, reduced.get(name, code)) for name, code in modules]
+
+
+def write_output(output: Path, code: MappedText, budgets: Optional[dict] = None) -> None:
+    """
+    生成コードと、その隣にソースマップ（hub_main.map.json）を書き出す。
+    書き出す前に compile() で検証し、通らなければ SyntaxError（前回の出力はそのまま残る）。
+    サイズの計測値を表示し、budgets（build_budgets.json）の上限を超えていれば書き出さずに BudgetExceeded。
+    """
+    text = code.text + "\n"
+    compile(text, output.name, "exec")
+    metrics = artifact_metrics(text)
+    print_metrics(metrics)
+    violations = check_budgets(metrics, budgets) if budgets else []
+    if violations:
+        print_block_metrics(metrics)
+        raise BudgetExceeded("; ".join(violations))
+    output.write_text(text, encoding="utf-8")
+    map_path = write_source_map(output, code.origins)
+    print(f"Source map: {map_path.name}")
+
+
+def write_modules(output_dir: Path, modules: Sequence[Tuple[str, MappedText]], budgets: Optional[dict] = None) -> List[Path]:
+    """
+    複数モジュール構成の各モジュール（モジュール名, コード）を output_dir に書き出し、パスを返す（先頭がメニュー）。
+    write_output と同じく全モジュールを compile() で検証し、budgets を超えていれば何も書き出さない。
+    run を消した場合に古い runXX.py が残らないよう、output_dir の他の .py / .map.json は削除する。
+    """
+    texts = [(name, code.text + "\n") for name, code in modules]
+    for name, text in texts:
+        compile(text, f"{name}.py", "exec")
+    labels = []
+    for name, text in texts:
+        if name.startswith(SETUP_MODULE):
+            labels.append(("setup", text))
+        elif name == MENU_MODULE:
+            labels.append(("menu", text))
+        else:
+            labels.append((name, text))
+    metrics = modules_metrics(labels)
+    print_metrics(metrics)
+    violations = check_budgets(metrics, budgets) if budgets else []
+    if violations:
+        print_block_metrics(metrics)
+        raise BudgetExceeded("; ".join(violations))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for (name, code), (_, text) in zip(modules, texts):
+        path = output_dir / f"{name}.py"
+        path.write_text(text, encoding="utf-8")
+        write_source_map(path, code.origins)
+        paths.append(path)
+    keep = {path.name for path in paths} | {source_map_path(path).name for path in paths}
+    for stale in list(output_dir.glob("*.py")) + list(output_dir.glob(f"*{SOURCE_MAP_SUFFIX}")):
+        if stale.name not in keep:
+            stale.unlink()
+    return paths
+
+
+def find_mpy_compiler() -> Optional[Tuple[str, Callable[[str, str], bytes]]]:
+    """
+    オフラインの mpy-cross を探し、(名前, コンパイル関数) を返す。見つからなければ None。
+    pybricksdev と一緒に入る mpy_cross_v6 パッケージを優先し、なければ PATH 上の mpy-cross を使う。
+    """
+    try:
+        import mpy_cross_v6
+    except ImportError:
+        mpy_cross_v6 = None
+
+    if mpy_cross_v6 is not None:
+
+        def compile_with_package(file_name: str, source: str) -> bytes:
+            proc, data = mpy_cross_v6.mpy_cross_compile(file_name, source, small_number_bits=31)
+            proc.check_returncode()
+            if data is None:
+                raise RuntimeError(f"mpy-cross produced no output for {file_name}")
+            return data
+
+        return f"mpy_cross_v6 {getattr(mpy_cross_v6, '__version__', '')}".strip(), compile_with_package
+
+    executable = shutil.which("mpy-cross")
+    if executable is None:
+        return None
+
+    def compile_with_executable(file_name: str, source: str) -> bytes:
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / file_name
+            dst = src.with_suffix(".mpy")
+            src.write_text(source, encoding="utf-8")
+            subprocess.run([executable, "-o", str(dst), str(src)], check=True, cwd=tmp)
+            return dst.read_bytes()
+
+    version = subprocess.run([executable, "--version"], check=False, capture_output=True, text=True)
+    return f"mpy-cross {version.stdout.strip()}".strip(), compile_with_executable
+
+
+def build_mpy(source_path: Path, cache_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    生成済みの hub_main.py を mpy-cross でコンパイルし、隣に .mpy を書き出す。
+    ソースとコンパイラのハッシュで cache_dir/mpy/ にキャッシュする。mpy-cross がなければ None。
+    """
+    compiler = find_mpy_compiler()
+    if compiler is None:
+        print("Warning: mpy-cross が見つかりません（pip install mpy-cross / pybricksdev）。.mpy は生成しません。")
+        return None
+    compiler_name, compile_fn = compiler
+
+    source = load_text(source_path)
+    key = hashlib.sha1(f"{compiler_name}\0{source}".encode("utf-8")).hexdigest()
+    output = source_path.with_suffix(".mpy")
+    cached = cache_dir / MPY_CACHE_SUBDIR / f"{key}.mpy" if cache_dir is not None else None
+    if cached is not None and cached.exists():
+        data = cached.read_bytes()
+        print(f"Reused cached {output.name} ({compiler_name})")
+    else:
+        data = compile_fn(source_path.name, source)
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            cached.write_bytes(data)
+        print(f"Compiled {output.name} with {compiler_name}")
+    output.write_bytes(data)
+    print(f"  {source_path.name}: {len(source.encode('utf-8'))} bytes -> {output.name}: {len(data)} bytes")
+    return output
+
+
+MENU_HEADER = [
+    "# Auto-generated menu hub_main.py. Do not edit this file on Hub.",
+    "# Select run on Hub; no PC-side RUN selection required.",
+    "from pybricks.hubs import PrimeHub",
+    "from pybricks.parameters import Button, Port",
+    "from pybricks.pupdevices import ForceSensor",
+    "from pybricks.tools import StopWatch, multitask, run_task, wait",
+    "",
+    "import gc",
+    "",
+    "try:",
+    "    import usys",
+    "    _print_exception = getattr(usys, 'print_exception', None)",
+    "except ImportError:",
+    "    _print_exception = None",
+    "_mem_free = getattr(gc, 'mem_free', None)",
+    "",
+    "_HUB = None",
+    "_TOUCH = None",
+    "_LAST_CONTEXT = None",
+    "_CONTEXT_SETUP = None",
+    "_LAUNCH_MS = None",
+    "_BUNDLES = {}",
+    "STORAGE_OFFSET = 0",
+    "STORAGE_LEN = 1",
+    "RUN_MIN = 1",
+    "MENU_POLL_MS = 10",
+    "SAVE_DELAY_MS = 1000",
+    "STOP_POLL_MS = 5",
+    "BUNDLE_MIN_FREE = 16000",
+]
+
+
+def menu_header(dev: bool = False) -> List[str]:
+    """メニューの先頭。dev=True なら DEV_BUILD = True（停止までの時間などの計測を表示する開発用ビルド）。"""
+    return MENU_HEADER + [f"DEV_BUILD = {dev}"]
+
+# メニューの実行時部分（run の選択・実行・停止）。hub_main.py の末尾にそのまま入る。
+MENU_RUNTIME = """
 class StopRequested(Exception):
     pass
 
@@ -314,12 +959,15 @@ class RunContext:
         self.right_wheel = right_wheel
         self.left_lift = left_lift
         self.right_lift = right_lift
+        # 緊急停止でブレーキをかけるモーター（駆動輪を止めると DriveBase も止まる）
+        self.motors = (left_wheel, right_wheel, left_lift, right_lift)
 
 
 class RunBundle:
-    def __init__(self, setup_fn, run_fn):
+    def __init__(self, setup_fn, run_fn, reset_fn=None):
         self.setup = setup_fn
         self.run = run_fn
+        self.reset = reset_fn
 
 
 def _get_hub():
@@ -366,12 +1014,12 @@ def _touch_pressed():
             return False
 
 
-def _wait_touch_release():
+async def _wait_touch_release():
     sensor = _get_touch()
     if sensor is None:
         return
     while _touch_pressed():
-        wait(20)
+        await wait(MENU_POLL_MS)
 
 
 def _read_last_selection():
@@ -400,118 +1048,452 @@ def _write_last_selection(value):
         pass
 
 
-def _wait_for_release(button):
+def _pressed_buttons(hub):
+    try:
+        return hub.buttons.pressed()
+    except Exception:
+        return ()
+
+
+def _show_selection(selected):
     hub = _get_hub()
-    while True:
+    try:
+        hub.display.text(str(int(selected)))
+    except Exception:
         try:
-            if button not in hub.buttons.pressed():
-                return
+            hub.display.number(int(selected))
         except Exception:
             pass
-        wait(20)
 
 
 def _stop_all_motors():
     ctx = _LAST_CONTEXT
-    if not ctx:
+    if ctx is None:
         return
     try:
-        ctx[1].stop()
+        for motor in ctx.motors:
+            motor.brake()
     except Exception:
-        pass
-    for motor in ctx[2:]:
-        try:
-            motor.stop()
-        except Exception:
-            pass
+        # どれかが失敗したときだけ、1 つずつ止め直す
+        for motor in ctx.motors:
+            try:
+                motor.brake()
+            except Exception:
+                pass
 
 
 async def _monitor_stop():
-    hub = _get_hub()
+    # 押されてからブレーキまでの遅れは最大 STOP_POLL_MS + ブレーキの時間
+    # 開発用ビルドでは、押されていなかった最後の確認からブレーキまでの時間（この遅れの上限）を表示する
+    pressed = _get_hub().buttons.pressed
+    watch = StopWatch() if DEV_BUILD else None
     while True:
         try:
-            pressed = hub.buttons.pressed()
+            stop = Button.CENTER in pressed()
         except Exception:
-            pressed = []
-        if Button.CENTER in pressed:
+            stop = False
+        if stop:
             _stop_all_motors()
+            if watch is not None:
+                print("Stop:", watch.time(), "ms from the last unpressed check to brake (checked every", STOP_POLL_MS, "ms)")
             raise StopRequested("center stop")
-        await wait(20)
+        if watch is not None:
+            watch.reset()
+        await wait(STOP_POLL_MS)
 
 
-def _run_selected(selected):
-    factory = RUNNERS.get(str(selected))
-    if factory is None:
+def _prepare_context(bundle):
+    # 前の run と同じ setup なら、ハブ・モーターを作り直さずに軽いリセットだけで使い回す
+    global _LAST_CONTEXT, _CONTEXT_SETUP
+    ctx = _LAST_CONTEXT
+    if ctx is not None and bundle.reset is not None and _CONTEXT_SETUP is bundle.setup:
+        try:
+            bundle.reset(ctx.hub, ctx.robot, ctx.left_wheel, ctx.right_wheel, ctx.left_lift, ctx.right_lift)
+            return ctx
+        except Exception as exc:
+            print("Reset failed, reinitializing:", exc)
+    _CONTEXT_SETUP = None
+    ctx = RunContext(*bundle.setup())
+    _LAST_CONTEXT = ctx
+    _CONTEXT_SETUP = bundle.setup
+    return ctx
+
+
+def _free_bundles(keep):
+    # 空きメモリが BUNDLE_MIN_FREE を切っていたら、選んだ run 以外の bundle を手放す
+    if _mem_free is None or _mem_free() >= BUNDLE_MIN_FREE:
+        return
+    gc.collect()
+    if _mem_free() >= BUNDLE_MIN_FREE:
+        return
+    for key in list(_BUNDLES):
+        if key != keep:
+            del _BUNDLES[key]
+    gc.collect()
+
+
+def _get_bundle(key):
+    # 一度作った bundle は使い回す（同じ run のやり直しでは def やミッションを作り直さない）
+    bundle = _BUNDLES.get(key)
+    if bundle is None:
+        _free_bundles(key)
+        bundle = RUNNERS[key]()
+        _BUNDLES[key] = bundle
+    return bundle
+
+
+async def _run_selected(selected):
+    # タッチセンサーを押している間に run の準備（初期化・リセット）を済ませ、離したらすぐ走り出す
+    global _CONTEXT_SETUP, _LAUNCH_MS
+    key = str(selected)
+    if key not in RUNNERS:
         return
+    _LAUNCH_MS = None
+    prepare_ms = 0
+    watch = StopWatch()
     try:
-        bundle = factory()
-        ctx = RunContext(*bundle.setup())
-        global _LAST_CONTEXT
-        _LAST_CONTEXT = ctx
-        run_task(multitask(_monitor_stop(), bundle.run(ctx)))
+        bundle = _get_bundle(key)
+        ctx = _prepare_context(bundle)
+        prepare_ms = watch.time()
+        await _wait_touch_release()
+        watch.reset()
+        await multitask(_monitor_stop(), _timed_run(bundle.run, ctx, watch))
     except StopRequested:
         return
     except BaseException as exc:
+        # ハードウェアのエラーかもしれないので、次の run は initialize_robot からやり直す
+        _CONTEXT_SETUP = None
         print("Run failed:", exc)
+        if _print_exception is not None:
+            # 行番号は python sourcemap.py で runXX のファイルに戻せる
+            _print_exception(exc)
         _stop_all_motors()
+    finally:
+        if DEV_BUILD and _LAUNCH_MS is not None:
+            print("Launch:", prepare_ms, "ms prepare,", _LAUNCH_MS, "ms from release to run entry")
 
 
-def select_loop():
-    _set_stop_button((Button.CENTER, Button.BLUETOOTH))
-    selected = _read_last_selection() or RUN_MIN
+async def _timed_run(run, ctx, watch):
+    # 測るのは離してから run の入口（_run_entry）を呼ぶまで（最初のモーター指令までではない）
+    # 表示は run の後（その間に print を挟まない）
+    global _LAUNCH_MS
+    _LAUNCH_MS = watch.time()
+    await run(ctx)
+
+
+class MenuState:
+    def __init__(self, selected):
+        self.selected = selected
+        self.saved = selected
+        self.changed = StopWatch()
+
+    def save(self):
+        if self.selected != self.saved:
+            _write_last_selection(self.selected)
+            self.saved = self.selected
+
+
+async def _wait_touch_press():
+    while not _touch_pressed():
+        await wait(MENU_POLL_MS)
+
+
+async def _select_with_buttons(menu):
+    # 左右ボタンは押した瞬間だけ数え（押したままの間は進まない）、選択が変わったらすぐ表示する
+    hub = _get_hub()
+    held = _pressed_buttons(hub)
     while True:
-        hub = _get_hub()
-        try:
-            hub.display.text(str(int(selected)))
-        except Exception:
-            try:
-                hub.display.number(int(selected))
-            except Exception:
-                pass
-        if _touch_pressed():
-            _wait_touch_release()
-            _write_last_selection(selected)
-            _run_selected(selected)
-            _wait_touch_release()
-        try:
-            pressed = hub.buttons.pressed()
-        except Exception:
-            pressed = []
-        if Button.LEFT in pressed:
-            _wait_for_release(Button.LEFT)
-            selected -= 1
+        pressed = _pressed_buttons(hub)
+        step = 0
+        if Button.LEFT in pressed and Button.LEFT not in held:
+            step = -1
+        elif Button.RIGHT in pressed and Button.RIGHT not in held:
+            step = 1
+        held = pressed
+        if step:
+            selected = menu.selected + step
             if selected < RUN_MIN:
                 selected = RUN_MAX
-            _write_last_selection(selected)
-        elif Button.RIGHT in pressed:
-            _wait_for_release(Button.RIGHT)
-            selected += 1
-            if selected > RUN_MAX:
+            elif selected > RUN_MAX:
                 selected = RUN_MIN
-            _write_last_selection(selected)
-        wait(20)
+            menu.selected = selected
+            menu.changed.reset()
+            _show_selection(selected)
+        await wait(MENU_POLL_MS)
+
+
+async def _save_when_still(menu):
+    # 選択が SAVE_DELAY_MS 変わらなかったら保存する。ボタンは見ず、時間が来たときだけ起きる
+    while True:
+        if menu.selected == menu.saved:
+            await wait(SAVE_DELAY_MS)
+            continue
+        left = SAVE_DELAY_MS - menu.changed.time()
+        if left > 0:
+            await wait(left)
+        else:
+            menu.save()
+
+
+async def select_loop():
+    # タッチセンサーを待つタスク・左右ボタンで選ぶタスク・選択を保存するタスクを multitask で同時に動かす
+    # センサーが押されたら（race）ほかの 2 つを止め、選択を保存して run を始める
+    _set_stop_button((Button.CENTER, Button.BLUETOOTH))
+    menu = MenuState(_read_last_selection() or RUN_MIN)
+    while True:
+        _show_selection(menu.selected)
+        await multitask(_wait_touch_press(), _select_with_buttons(menu), _save_when_still(menu), race=True)
+        menu.save()
+        await _run_selected(menu.selected)
+        await _wait_touch_release()
 
 
 def main():
-    return select_loop()
+    run_task(select_loop())
 
 
 if __name__ == "__main__":
     main()
 """.strip()
-    )
 
-    output.write_text("\n".join(header + body) + "\n", encoding="utf-8")
+
+def build_multi(
+    run_dirs: Sequence[Path],
+    output: Path,
+    cache: Optional[BuildCache] = None,
+    minify: bool = False,
+    keep_variants: bool = False,
+    keep_dead_code: bool = False,
+    jobs: Optional[int] = None,
+    budgets: Optional[dict] = None,
+    dev: bool = False,
+) -> None:
+    """
+    複数 run を 1 ファイルにまとめ、Hub のメニューで切り替える hub_main.py を生成する。
+    cache を渡すと、内容が変わっていない setup / run ブロックは再生成せずに再利用する。
+    minify=True なら docstring・コメント・空白を落とした本番用コードを書き出す。
+    keep_variants=True なら採用されない variant の mission も含める（従来の動作）。
+    keep_dead_code=True なら到達できない関数・メソッドも残す。
+    キャッシュにない run ブロックは jobs 個のプロセスで並列に作り、run 名の順に並べる（build_run_blocks）。
+    budgets（build_budgets.json の内容）を渡すと、上限を超えた場合は書き出さずに BudgetExceeded。
+    dev=True なら停止までの時間などを Hub で表示する開発用ビルドにする（menu_header）。
+    """
+    if cache is None:
+        cache = BuildCache()
+    if not run_dirs:
+        raise FileNotFoundError("No run directories found.")
+
+    run_dirs = sorted(run_dirs, key=lambda p: p.name)
+
+    body = MappedText(menu_header(dev))
+    # 内容が同じ setup.py は 1 回だけ展開し、各 run から共有する
+    shared_setups: Dict[str, Tuple[str, List[str]]] = {}
+    setup_users: Dict[str, List[str]] = {}
+    run_setups: Dict[str, Tuple[str, List[str]]] = {}
+    for run_dir in run_dirs:
+        setup_path = run_dir / "setup.py"
+        if not setup_path.exists():
+            continue
+        setup_text = load_text(setup_path)
+        digest = setup_digest(setup_text)
+        if digest not in shared_setups:
+            setup_ref = f"_SETUP_{digest}"
+            setup_key = f"{build_version()}:{digest}"
+            entry = cache.get(f"setup_{digest}", setup_key)
+            if entry is None:
+                setup_code, setup_names, line_map = rewrite_setup(setup_text)
+                block = build_setup_block(setup_ref, setup_code, setup_names, source_name(setup_path), line_map)
+                entry = {"code": block.to_json(), "names": setup_names}
+                cache.put(f"setup_{digest}", setup_key, **entry)
+            shared_setups[digest] = (setup_ref, entry["names"])
+            setup_users[digest] = []
+            body.add("")
+            body.add(MappedText.from_json(entry["code"]))
+        setup_users[digest].append(run_dir.name)
+        run_setups[run_dir.name] = shared_setups[digest]
+
+    factory_entries: List[str] = []
+    run_entries: Dict[str, dict] = {}
+    pending: List[Tuple[str, str, RunBlockTask]] = []
+    for idx, run_dir in enumerate(run_dirs, start=1):
+        run_name = run_dir.name
+        factory_entries.append(f"    \"{idx}\": _make_{run_name}")
+        run_key = run_cache_key(run_dir, options=f"keep_variants={keep_variants}")
+        entry = cache.get(run_name, run_key)
+        if entry is None:
+            pending.append((run_name, run_key, (run_dir, run_setups.get(run_name), keep_variants, False)))
+        else:
+            run_entries[run_name] = entry
+
+    results = build_run_blocks([task for _, _, task in pending], jobs=jobs)
+    for (run_name, run_key, _), (code, printed) in zip(pending, results):
+        print(printed, end="")
+        entry = {"code": code}
+        cache.put(run_name, run_key, **entry)
+        run_entries[run_name] = entry
+
+    for run_dir in run_dirs:
+        body.add("")
+        body.add(MappedText.from_json(run_entries[run_dir.name]["code"]))
+
+    max_run = len(run_dirs)
+    menu_line = f"RUN_MAX = {max_run}"
+    body.add("")
+    body.add(menu_line)
+    body.add("")
+    body.add("RUNNERS = {\n" + ",\n".join(factory_entries) + "\n}")
+    body.add(MENU_RUNTIME)
+
+    write_output(output, finish_output(body, minify=minify, keep_dead_code=keep_dead_code), budgets)
     print(f"Generated {output} with runs: {[d.name for d in run_dirs]}")
+    for digest, users in setup_users.items():
+        print(f"  setup {shared_setups[digest][0]}: {users}")
+
+
+def module_loader(run_name: str) -> str:
+    """メニューから run モジュールを読み込むファクトリ。import は静的に書き、pybricksdev の複数ファイル送信で同梱させる。"""
+    return "\n".join(
+        [
+            f"def _make_{run_name}():",
+            f"    _unload_runs({run_name!r})",
+            f"    import {run_name}",
+            f"    return RunBundle({run_name}.initialize_robot, {run_name}._run_entry, getattr({run_name}, {RESET_FUNCTION!r}, None))",
+        ]
+    )
 
 
-def build(run_dir: Path, output: Path, mission_override: Optional[str] = None) -> None:
-    mission_files = [
-        path
-        for path in sorted(run_dir.glob("[mM]*.py"))
-        if path.name != "main.py" and re.match(r"[mM]\d", path.stem)
-    ]
-    if not mission_files:
+def build_modules(
+    run_dirs: Sequence[Path],
+    output_dir: Path,
+    cache: Optional[BuildCache] = None,
+    minify: bool = False,
+    keep_variants: bool = False,
+    keep_dead_code: bool = False,
+    jobs: Optional[int] = None,
+    budgets: Optional[dict] = None,
+    dev: bool = False,
+) -> List[Path]:
+    """
+    build_multi と同じメニューを、1 run 1 モジュールの構成で output_dir（hub_modules/）に書き出す。
+    - hub_main.py: メニュー。選ばれた run のモジュールだけを import し、前の run のモジュールは手放す
+    - robotlib_<hash>.py: 共有 setup（内容が同じ setup.py ごとに 1 つ。名前は内容のハッシュ）
+    - runXX.py: mission / main と run 入口
+    Hub のメニュー中に持つメモリは 1 run 分になる。到達できないコードの削除は、モジュールの間で使われる名前を
+    たどってモジュールごとに行う（eliminate_module_dead_code。keep_dead_code=True なら行わない）。
+    書き出したモジュールのパス（先頭がメニュー）を返す。dev は build_multi と同じ。
+    """
+    if cache is None:
+        cache = BuildCache()
+    if not run_dirs:
+        raise FileNotFoundError("No run directories found.")
+
+    run_dirs = sorted(run_dirs, key=lambda p: p.name)
+    modules: List[Tuple[str, MappedText]] = []
+    setup_modules: Dict[str, Tuple[str, List[str]]] = {}
+    setup_users: Dict[str, List[str]] = {}
+    run_setups: Dict[str, Tuple[str, List[str]]] = {}
+    for run_dir in run_dirs:
+        setup_path = run_dir / "setup.py"
+        if not setup_path.exists():
+            continue
+        setup_text = load_text(setup_path)
+        digest = setup_digest(setup_text)
+        if digest not in setup_modules:
+            # 名前は内容だけで決める。runXX.py のキャッシュ（キーは自分の setup.py を含む）に埋め込んだ import 先が、
+            # ほかの run の setup.py の変更や run の順番で別の setup を指すことがないようにする
+            module_name = f"{SETUP_MODULE}_{digest}"
+            setup_key = f"{build_version()}:{digest}"
+            entry = cache.get(f"module_setup_{digest}", setup_key)
+            if entry is None:
+                setup_code, setup_names, line_map = rewrite_setup(setup_text)
+                block = MappedText(["# Auto-generated shared setup. Do not edit this file on Hub."])
+                block.add(setup_code, source_name(setup_path), line_map)
+                entry = {"code": block.to_json(), "names": setup_names}
+                cache.put(f"module_setup_{digest}", setup_key, **entry)
+            setup_modules[digest] = (module_name, entry["names"])
+            setup_users[digest] = []
+            modules.append((module_name, MappedText.from_json(entry["code"])))
+        setup_users[digest].append(run_dir.name)
+        run_setups[run_dir.name] = setup_modules[digest]
+
+    run_entries: Dict[str, dict] = {}
+    pending: List[Tuple[str, str, RunBlockTask]] = []
+    for run_dir in run_dirs:
+        run_name = run_dir.name
+        run_key = run_cache_key(run_dir, options=f"keep_variants={keep_variants},module")
+        entry = cache.get(f"module_{run_name}", run_key)
+        if entry is None:
+            pending.append((run_name, run_key, (run_dir, run_setups.get(run_name), keep_variants, True)))
+        else:
+            run_entries[run_name] = entry
+
+    results = build_run_blocks([task for _, _, task in pending], jobs=jobs)
+    for (run_name, run_key, _), (code, printed) in zip(pending, results):
+        print(printed, end="")
+        entry = {"code": code}
+        cache.put(f"module_{run_name}", run_key, **entry)
+        run_entries[run_name] = entry
+    for run_dir in run_dirs:
+        modules.append((run_dir.name, MappedText.from_json(run_entries[run_dir.name]["code"])))
+
+    run_names = [run_dir.name for run_dir in run_dirs]
+    menu = MappedText(menu_header(dev))
+    menu.add("")
+    menu.add(f"RUN_MAX = {len(run_dirs)}")
+    menu.add(f"RUN_MODULES = {tuple(run_names)!r}")
+    menu.add(
+        """
+
+def _unload_runs(keep):
+    # 前に選んだ run のモジュールと bundle を手放してから次を import する（メニュー中のメモリは 1 run 分）
+    for key in list(_BUNDLES):
+        if RUN_MODULES[int(key) - 1] != keep:
+            del _BUNDLES[key]
+    try:
+        import usys
+        modules = usys.modules
+    except (ImportError, AttributeError):
+        return
+    for name in RUN_MODULES:
+        if name != keep and name in modules:
+            del modules[name]
+    gc.collect()"""
+    )
+    for run_name in run_names:
+        menu.add("")
+        menu.add("")
+        menu.add(module_loader(run_name))
+    menu.add("")
+    menu.add("")
+    menu.add(
+        "RUNNERS = {\n" + ",\n".join(f'    "{idx}": _make_{name}' for idx, name in enumerate(run_names, start=1)) + "\n}"
+    )
+    menu.add("")
+    menu.add("")
+    menu.add(MENU_RUNTIME)
+    modules.insert(0, (MENU_MODULE, menu))
+    if not keep_dead_code:
+        modules = eliminate_module_dead_code(modules, run_setups)
+
+    finished = [(name, finish_output(code, minify=minify, keep_dead_code=True)) for name, code in modules]
+    paths = write_modules(output_dir, finished, budgets)
+    print(f"Generated {output_dir} with modules: {[path.stem for path in paths]}")
+    for digest, users in setup_users.items():
+        print(f"  {setup_modules[digest][0]}: {users}")
+    return paths
+
+
+def build(
+    run_dir: Path,
+    output: Path,
+    mission_override: Optional[str] = None,
+    minify: bool = False,
+    keep_variants: bool = False,
+    keep_dead_code: bool = False,
+    budgets: Optional[dict] = None,
+) -> None:
+    all_mission_files = find_mission_files(run_dir)
+    if not all_mission_files:
         raise FileNotFoundError(f"No mission file (m*.py) found in {run_dir}")
 
     setup_path = run_dir / "setup.py"
@@ -519,32 +1501,55 @@ def build(run_dir: Path, output: Path, mission_override: Optional[str] = None) -
     if not main_path.exists():
         raise FileNotFoundError(f"main.py not found in {run_dir}")
 
+    mission_files, variant_key = select_missions(
+        run_dir, all_mission_files, keep_variants=keep_variants, mission_override=mission_override
+    )
+    dropped = [path.stem for path in all_mission_files if path not in mission_files]
+
     mission_names: List[str] = []
-    parts: List[str] = [
-        f"# Auto-generated from {run_dir.name}. Do not edit this file on Hub.",
-        f"# Missions: {', '.join(path.stem for path in mission_files)}",
-    ]
+    parts: List[MappedText] = []
+
+    def add_part(text: str, source: Optional[str] = None, line_map: Optional[Dict[int, int]] = None) -> None:
+        part = MappedText()
+        part.add(text, source, line_map)
+        parts.append(part)
+
+    add_part(f"# Auto-generated from {run_dir.name}. Do not edit this file on Hub.")
+    add_part(f"# Missions: {', '.join(path.stem for path in mission_files)}")
 
     for mission_path in mission_files:
         mission_name = mission_path.stem
         mission_names.append(mission_name)
-        mission_text, exports, global_names = rewrite_mission(mission_path)
-        parts.append(f"# ---- mission: {mission_name} ----")
-        parts.append(mission_text)
-        parts.append(mission_binding(mission_name, exports, global_names))
+        mission_text, exports, global_names, line_map = rewrite_mission(mission_path)
+        add_part(f"# ---- mission: {mission_name} ----")
+        add_part(mission_text, source_name(mission_path), line_map)
+        add_part(mission_binding(mission_name, exports, global_names))
 
     if setup_path.exists():
-        parts.append("# ---- setup ----")
-        parts.append(load_text(setup_path))
+        add_part("# ---- setup ----")
+        setup_code, _, line_map = rewrite_setup(load_text(setup_path))
+        add_part(setup_code, source_name(setup_path), line_map)
 
-    parts.append("# ---- main ----")
+    add_part("# ---- main ----")
     main_text = load_text(main_path)
-    parts.append(rewrite_main(main_text, mission_names, mission_override=mission_override))
-    parts.append("\n# ---- entry ----")
-    parts.append('if __name__ == "__main__":')
-    parts.append("    main()")
-
-    output.write_text("\n\n".join(parts) + "\n", encoding="utf-8")
+    main_code, line_map = rewrite_main(
+        main_text,
+        mission_names,
+        mission_override=mission_override,
+        variant_key=variant_key,
+        dropped_missions=dropped,
+    )
+    add_part(main_code, source_name(main_path), line_map)
+    add_part("\n# ---- entry ----")
+    add_part('if __name__ == "__main__":')
+    add_part("    main()")
+
+    code = MappedText()
+    for index, part in enumerate(parts):
+        if index:
+            code.add("")
+        code.add(part)
+    write_output(output, finish_output(code, minify=minify, keep_dead_code=keep_dead_code), budgets)
     print(f"Generated {output} from {run_dir.name}")
 
 
@@ -556,11 +1561,131 @@ def main():
         default="hub_main.py",
         help="output filename (default: hub_main.py)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"regenerate every run block without using {BUILD_CACHE_DIR}/",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report build cache hits/misses and build wall time",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="strip docstrings/comments/whitespace and shorten local names (production build)",
+    )
+    parser.add_argument(
+        "--mpy",
+        action="store_true",
+        help="also emit a precompiled .mpy next to the output (requires mpy-cross)",
+    )
+    parser.add_argument(
+        "--keep-variants",
+        action="store_true",
+        help="include every m*.py variant instead of only the active one",
+    )
+    parser.add_argument(
+        "--keep-dead-code",
+        action="store_true",
+        help="keep functions/methods that no run can reach",
+    )
+    parser.add_argument(
+        "--dev",
+        action="store_true",
+        help="development build: print stop timing on the hub",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and rebuild whenever a runXX/*.py file changes",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help=f"processes for generating run blocks (default: CPU count when {PARALLEL_MIN_RUNS}+ runs need rebuilding)",
+    )
+    parser.add_argument(
+        "--budgets",
+        default=BUDGETS_FILE,
+        help=f"size budget file; the build fails when a run exceeds it (default: {BUDGETS_FILE}, skipped if missing)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=("single", "modules"),
+        default="single",
+        help=f"single: one hub_main.py (default); modules: {MODULES_DIR}/ with one module per run plus {SETUP_MODULE}",
+    )
     args = parser.parse_args()
 
     root = Path(__file__).resolve().parent
     run_dirs = [p for p in root.glob("run*") if p.is_dir() and re.match(r"run\d+", p.name)]
-    build_multi(run_dirs, root / args.output)
+    cache = BuildCache(None if args.no_cache else root / BUILD_CACHE_DIR)
+    budgets = load_budgets(root / args.budgets)
+
+    def run_build() -> List[Path]:
+        if args.layout == "modules":
+            paths = build_modules(
+                run_dirs,
+                root / MODULES_DIR,
+                cache=cache,
+                minify=args.minify,
+                keep_variants=args.keep_variants,
+                keep_dead_code=args.keep_dead_code,
+                jobs=args.jobs,
+                budgets=budgets,
+                dev=args.dev,
+            )
+        else:
+            build_multi(
+                run_dirs,
+                root / args.output,
+                cache=cache,
+                minify=args.minify,
+                keep_variants=args.keep_variants,
+                keep_dead_code=args.keep_dead_code,
+                jobs=args.jobs,
+                budgets=budgets,
+                dev=args.dev,
+            )
+            paths = [root / args.output]
+        if args.mpy:
+            for path in paths:
+                build_mpy(path, cache_dir=cache.cache_dir)
+        return paths
+
+    timer = time.perf_counter()
+    if not args.watch:
+        try:
+            paths = run_build()
+        except BudgetExceeded as exc:
+            raise SystemExit(f"Build failed: over budget ({exc})")
+        if args.stats:
+            cache.report((time.perf_counter() - timer) * 1000)
+            if args.layout == "modules":
+                print_block_metrics(modules_metrics([(path.stem, load_text(path)) for path in paths]))
+            else:
+                print_block_metrics(artifact_metrics(load_text(paths[0])))
+        return
+
+    def on_change(changed) -> None:
+        if changed:
+            print(f"Changed: {', '.join(sorted(source_name(path) for path in changed))}")
+        cache.reset_stats()
+        timer = time.perf_counter()
+        try:
+            run_build()
+        except Exception as exc:
+            # 書きかけのファイルでも監視は止めない（前回の hub_main.py はそのまま）
+            print(f"Build failed: {type(exc).__name__}: {exc}")
+            return
+        cache.report((time.perf_counter() - timer) * 1000)
+
+    on_change(set())
+    watch_runs(run_dirs, on_change)
 
 
 if __name__ == "__main__":
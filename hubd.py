@@ -0,0 +1,216 @@
+"""
+PC側の BLE セッション常駐プロセス。Hub には送らない。
+Hub との接続を開いたままにし、selector.py --daemon からローカルのソケット経由で受け取った program をそのまま Hub に送る。
+pybricksdev を毎回起動したときのスキャン・接続・切断（数秒）が、2 回目からはなくなる。
+
+使い方:
+    python hubd.py                          # 別のターミナルで起動したままにする（Ctrl+C で切断して終了）
+    python selector.py --daemon             # 送信を hubd に任せる（.mpy にコンパイルしてから渡す）
+    python hubd.py --fake-hub /tmp/hub      # Hub なしで試す（upload.FakeHub に送る）
+
+やりとりは 1 接続 1 回: JSON の 1 行（hub, start, format, size）と program 本体を送り、結果の JSON 1 行を受け取る。
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from upload import FakeHub
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+Connector = Callable[[str], Awaitable[object]]
+
+
+def encode_request(hub_name: str, program: bytes, start: bool, program_format: str) -> bytes:
+    """hubd への 1 回分の送信データ。program_format は "mpy"（コンパイル済み）か "source"。"""
+    header = {"hub": hub_name, "start": start, "format": program_format, "size": len(program)}
+    return json.dumps(header).encode("utf-8") + b"\n" + program
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[dict, bytes]:
+    header = json.loads(await reader.readline())
+    program = await reader.readexactly(int(header["size"]))
+    return header, program
+
+
+async def connect_ble(hub_name: str):
+    """pybricksdev で hub_name を探して接続した PybricksHubBLE を返す。"""
+    from pybricksdev.ble import find_device
+    from pybricksdev.connections.pybricks import PybricksHubBLE
+
+    print(f"Scanning for {hub_name!r}...")
+    hub = PybricksHubBLE(await find_device(hub_name))
+    await hub.connect()
+    return hub
+
+
+def fake_connector(directory: Path) -> Connector:
+    """BLE の代わりに upload.FakeHub へつなぐ connector（Hub なしでの確認用）。"""
+
+    async def connect(hub_name: str):
+        hub = FakeHub(directory, hub_name)
+        await hub.connect()
+        return hub
+
+    return connect
+
+
+class HubSessions:
+    """
+    Hub 名ごとに接続を開いたまま持つ。送信に失敗したら接続を捨て、1 回だけつなぎ直して送り直す。
+    同じ Hub への送信は 1 つずつ、別の Hub へは並行して送れる。
+    """
+
+    def __init__(self, connect: Connector):
+        self.connect = connect
+        self.hubs: Dict[str, object] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    async def open(self, hub_name: str) -> Tuple[object, bool]:
+        """(接続済みの hub, 既存の接続を使ったか) を返す。"""
+        hub = self.hubs.get(hub_name)
+        if hub is not None:
+            return hub, True
+        hub = await self.connect(hub_name)
+        self.hubs[hub_name] = hub
+        print(f"Connected to {hub_name!r}")
+        return hub, False
+
+    async def drop(self, hub_name: str) -> None:
+        hub = self.hubs.pop(hub_name, None)
+        if hub is None:
+            return
+        try:
+            await hub.disconnect()
+        except Exception:
+            pass
+
+    async def send(self, hub_name: str, program: bytes, start: bool) -> bool:
+        """program を送り（start なら開始し）、既存の接続を使えたかを返す。"""
+        lock = self.locks.setdefault(hub_name, asyncio.Lock())
+        async with lock:
+            hub, reused = await self.open(hub_name)
+            try:
+                await hub.download_user_program(program)
+            except Exception as exc:
+                await self.drop(hub_name)
+                if not reused:
+                    raise
+                # Hub の電源を切った・離れたなどで切れていた接続。つなぎ直して 1 回だけ送り直す
+                print(f"Reconnecting to {hub_name!r} ({type(exc).__name__}: {exc})")
+                hub, reused = await self.open(hub_name)
+                await hub.download_user_program(program)
+            if start:
+                await hub.start_user_program()
+            return reused
+
+    async def close(self) -> None:
+        for hub_name in list(self.hubs):
+            await self.drop(hub_name)
+            print(f"Disconnected from {hub_name!r}")
+
+
+async def handle_client(
+    sessions: HubSessions, accept_source: bool, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    timer = time.perf_counter()
+    try:
+        header, program = await read_request(reader)
+        hub_name = header["hub"]
+        if header.get("format") != "mpy" and not accept_source:
+            raise ValueError("the hub needs a compiled program; run selector.py with --mpy")
+        reused = await sessions.send(hub_name, program, bool(header.get("start")))
+        elapsed_ms = (time.perf_counter() - timer) * 1000
+        print(f"Sent {len(program)} bytes to {hub_name!r} in {elapsed_ms:.0f} ms ({'reused' if reused else 'new'} connection)")
+        response = {"ok": True, "ms": round(elapsed_ms), "reused": reused}
+    except Exception as exc:
+        print(f"Send failed: {type(exc).__name__}: {exc}")
+        response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+    await writer.drain()
+    writer.close()
+
+
+async def serve(
+    sessions: HubSessions,
+    port: int = DEFAULT_PORT,
+    accept_source: bool = False,
+    ready: Optional[asyncio.Future] = None,
+) -> None:
+    """
+    ローカルのソケットで送信を待ち受ける。accept_source=True ならソースのままの program も受け付ける（FakeHub 用）。
+    port=0 なら空いているポートを使う。ready を渡すと、待ち受けを始めたときに実際のポート番号が入る。
+    """
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(sessions, accept_source, reader, writer), HOST, port
+    )
+    port = server.sockets[0].getsockname()[1]
+    print(f"hubd listening on {HOST}:{port}. Ctrl+C to stop.")
+    if ready is not None:
+        ready.set_result(port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await sessions.close()
+
+
+def send_via_daemon(
+    program: bytes, hub_name: str, start: bool, program_format: str, port: int = DEFAULT_PORT, timeout: float = 120.0
+) -> dict:
+    """
+    起動中の hubd に program を渡し、結果（ok, ms, reused / error）を返す。
+    hubd が起動していなければ ConnectionRefusedError（呼び出し側で直接送信に戻る）。
+    つないだ後のエラー（タイムアウト・切断・壊れた応答）は ConnectionError にする。
+    hubd がもう Hub に送って走らせているかもしれないので、直接送り直してはいけない。
+    """
+    with socket.create_connection((HOST, port), timeout=timeout) as conn:
+        try:
+            conn.sendall(encode_request(hub_name, program, start, program_format))
+            conn.shutdown(socket.SHUT_WR)
+            response = b""
+            while not response.endswith(b"\n"):
+                chunk = conn.recv(4096)
+                if not chunk:
+                    break
+                response += chunk
+        except OSError as exc:
+            raise ConnectionError(f"hubd did not answer ({exc!r}); the program may already be on the hub") from exc
+    try:
+        return json.loads(response)
+    except ValueError as exc:
+        raise ConnectionError(f"hubd sent no valid result ({response[:80]!r}); the program may already be on the hub") from exc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PC-only: keep hub BLE connections open and upload programs sent by selector.py")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"local TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--fake-hub",
+        metavar="DIR",
+        help="use a local stand-in that stores programs in DIR instead of connecting over BLE",
+    )
+    args = parser.parse_args()
+
+    if args.fake_hub:
+        sessions = HubSessions(fake_connector(Path(args.fake_hub).resolve()))
+    else:
+        try:
+            import pybricksdev  # noqa: F401
+        except ImportError:
+            raise SystemExit("pybricksdev が見つかりません。pipx/pip でインストールしてください。")
+        sessions = HubSessions(connect_ble)
+    try:
+        asyncio.run(serve(sessions, args.port, accept_source=bool(args.fake_hub)))
+    except KeyboardInterrupt:
+        print("hubd stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+PC側で使う生成物の計測。build.py から呼ばれる。Hub には送らない。
+hub_main.py の大きさ（バイト数・行数・関数の数）と、関数・クラス・定数が Hub のヒープに占める量の目安を
+run ブロックごとに出し、build_budgets.json の上限と比べる。
+
+ヒープ量は MicroPython の実装をもとにした概算（HEAP_* の定数）で、実機の gc.mem_free() の差とは一致しない。
+増え方を比べるための目安として使う。
+"""
+
+import ast
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+BUDGETS_FILE = "build_budgets.json"
+METRIC_KEYS = ("bytes", "lines", "functions", "heap_bytes")
+
+# 関数 1 つあたり: raw code 構造体 + 関数オブジェクト
+HEAP_PER_FUNCTION = 48
+# AST ノード 1 つあたりのバイトコード量
+HEAP_PER_NODE = 3
+# クラス 1 つあたり: 型オブジェクト + locals dict
+HEAP_PER_CLASS = 96
+# 文字列・float・大きな整数など、ヒープに置かれる定数のヘッダ
+HEAP_PER_OBJECT = 16
+SMALL_INT_BITS = 30
+
+
+class BudgetExceeded(Exception):
+    """生成物が build_budgets.json の上限を超えた場合に送出する。"""
+
+
+def is_docstring(node: ast.AST, parent: Optional[ast.AST]) -> bool:
+    if not isinstance(parent, (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return False
+    return bool(parent.body) and parent.body[0] is node
+
+
+def heap_estimate(tree: ast.AST) -> int:
+    """関数・クラス・定数から、読み込み時に確保されるヒープ量の目安（バイト）を返す。docstring は数えない。"""
+    total = 0
+    parents: Dict[int, ast.AST] = {}
+    for node in ast.walk(tree):
+        for child in ast.iter_child_nodes(node):
+            parents[id(child)] = node
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            total += HEAP_PER_FUNCTION
+        elif isinstance(node, ast.ClassDef):
+            total += HEAP_PER_CLASS
+        elif isinstance(node, ast.Constant):
+            value = node.value
+            if isinstance(value, str):
+                expr = parents.get(id(node))
+                if isinstance(expr, ast.Expr) and is_docstring(expr, parents.get(id(expr))):
+                    continue
+                total += HEAP_PER_OBJECT + len(value.encode("utf-8"))
+            elif isinstance(value, float):
+                total += HEAP_PER_OBJECT
+            elif isinstance(value, int) and not isinstance(value, bool) and abs(value) >> SMALL_INT_BITS:
+                total += HEAP_PER_OBJECT
+        if isinstance(node, (ast.stmt, ast.expr)):
+            total += HEAP_PER_NODE
+    return total
+
+
+def block_metrics(lines: List[str], node: ast.AST) -> Dict[str, int]:
+    """lines（生成コード全体）のうち node の範囲について、METRIC_KEYS の値を返す。"""
+    text = "\n".join(lines[node.lineno - 1 : node.end_lineno]) + "\n"
+    functions = sum(isinstance(sub, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)) for sub in ast.walk(node))
+    return {
+        "bytes": len(text.encode("utf-8")),
+        "lines": node.end_lineno - node.lineno + 1,
+        "functions": functions,
+        "heap_bytes": heap_estimate(node),
+    }
+
+
+def artifact_metrics(code: str) -> Dict[str, Dict[str, int]]:
+    """
+    生成コード全体（"total"）と、_make_runXX ごと（"runXX"）、共有 setup（"setup"）の計測値を返す。
+    """
+    tree = ast.parse(code)
+    lines = code.splitlines()
+    functions = sum(isinstance(sub, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)) for sub in ast.walk(tree))
+    metrics: Dict[str, Dict[str, int]] = {
+        "total": {
+            "bytes": len(code.encode("utf-8")),
+            "lines": len(lines),
+            "functions": functions,
+            "heap_bytes": heap_estimate(tree),
+        }
+    }
+    for stmt in tree.body:
+        if not isinstance(stmt, ast.FunctionDef) or not stmt.name.startswith("_make_"):
+            continue
+        label = stmt.name[len("_make_") :]
+        if label.startswith("SETUP_"):
+            label = "setup"
+        block = block_metrics(lines, stmt)
+        if label in metrics:
+            block = {key: metrics[label][key] + block[key] for key in METRIC_KEYS}
+        metrics[label] = block
+    return metrics
+
+
+def modules_metrics(modules: Sequence[Tuple[str, str]]) -> Dict[str, Dict[str, int]]:
+    """
+    複数モジュール構成（build.build_modules）の計測値を返す。modules は (ラベル, コード) の列。
+    同じラベル（例: 複数の robotlib をまとめた "setup"）は合計し、"total" は全モジュールの合計。
+    """
+    metrics: Dict[str, Dict[str, int]] = {"total": dict.fromkeys(METRIC_KEYS, 0)}
+    for label, code in modules:
+        tree = ast.parse(code)
+        values = {
+            "bytes": len(code.encode("utf-8")),
+            "lines": len(code.splitlines()),
+            "functions": sum(
+                isinstance(sub, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)) for sub in ast.walk(tree)
+            ),
+            "heap_bytes": heap_estimate(tree),
+        }
+        for target in ("total", label):
+            current = metrics.setdefault(target, dict.fromkeys(METRIC_KEYS, 0))
+            for key in METRIC_KEYS:
+                current[key] += values[key]
+    return metrics
+
+
+def load_budgets(path: Path) -> Optional[dict]:
+    """build_budgets.json を読む。ファイルがなければ None（上限チェックなし）。"""
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def check_budgets(metrics: Dict[str, Dict[str, int]], budgets: dict) -> List[str]:
+    """
+    上限を超えた項目の説明を返す（超えていなければ空リスト）。
+    budgets の "total" は全体、"run" は全 run 共通、"runs" の runXX はその run だけの上限（"run" より優先）。
+    """
+    violations: List[str] = []
+    for label, values in metrics.items():
+        if label == "total":
+            limits = budgets.get("total", {})
+        elif label.startswith("run"):
+            limits = dict(budgets.get("run", {}), **budgets.get("runs", {}).get(label, {}))
+        else:
+            limits = budgets.get(label, {})
+        for key in METRIC_KEYS:
+            if key in limits and values[key] > limits[key]:
+                violations.append(f"{label}: {key} {values[key]} > budget {limits[key]}")
+    return violations
+
+
+def print_metrics(metrics: Dict[str, Dict[str, int]]) -> None:
+    """全体の計測値を 1 行で表示する。"""
+    total = metrics["total"]
+    print(
+        f"Artifact: {total['bytes']} bytes, {total['lines']} lines, "
+        f"{total['functions']} functions, ~{total['heap_bytes']} heap bytes (estimate)"
+    )
+
+
+def print_block_metrics(metrics: Dict[str, Dict[str, int]]) -> None:
+    """setup / run ブロックごとの計測値を表で表示する。"""
+    for label, values in metrics.items():
+        if label == "total":
+            continue
+        print(
+            f"  {label:<8} {values['bytes']:>7} bytes {values['lines']:>5} lines "
+            f"{values['functions']:>4} functions ~{values['heap_bytes']:>6} heap bytes"
+        )
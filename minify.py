@@ -0,0 +1,264 @@
+"""
+PC側で実行する minify 処理。build.py の --minify から呼ばれる。
+生成済みの Hub 用コードから docstring・コメント・余分な空白を取り除き、
+安全に判定できる関数ではローカル変数名を短くする。
+
+結果は元コードと AST を比較して同じ意味であることを確認してから返す。
+
+使い方:
+    python build.py --minify
+"""
+
+import ast
+import io
+import tokenize
+from typing import Dict, List, Optional, Set
+
+_SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)
+_COMPREHENSION_NODES = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_DOC_OWNERS = (ast.Module, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_NAME_INTROSPECTION = {"locals", "vars", "eval", "exec"}
+
+
+class MinifyError(Exception):
+    """minify 結果が元コードと同じ意味にならなかった場合に送出する。"""
+
+
+def strip_docstrings(tree: ast.AST) -> ast.AST:
+    """モジュール・関数・クラスの docstring を取り除く（空になった本体には pass を補う）。"""
+    for node in ast.walk(tree):
+        if not isinstance(node, _DOC_OWNERS) or not node.body:
+            continue
+        first = node.body[0]
+        if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+            node.body = node.body[1:] or [ast.Pass()]
+    return tree
+
+
+def collect_identifiers(tree: ast.AST) -> Set[str]:
+    """ツリー内に現れる識別子をすべて集める（短縮名の衝突回避用）。"""
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, ast.keyword) and node.arg:
+            names.add(node.arg)
+        elif isinstance(node, ast.alias):
+            names.add(node.asname or node.name.split(".")[0])
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+    return names
+
+
+def short_names(reserved: Set[str]):
+    """_a, _b, ..., _aa, ... の順に、reserved と衝突しない名前を返し続ける。"""
+    letters = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    length = 1
+    while True:
+        total = len(letters) ** length
+        for index in range(total):
+            chars = []
+            for _ in range(length):
+                index, rem = divmod(index, len(letters))
+                chars.append(letters[rem])
+            name = "_" + "".join(chars)
+            if name not in reserved:
+                yield name
+        length += 1
+
+
+def renamable_locals(func: ast.AST) -> List[str]:
+    """
+    関数内で安全に改名できるローカル変数名を返す。
+    入れ子のスコープ・global/nonlocal・locals() などがある関数は対象外（空リスト）。
+    引数はキーワード指定で呼ばれる可能性があるので改名しない。
+    """
+    stored: List[str] = []
+    imported: Set[str] = set()
+    for stmt in func.body:
+        for node in ast.walk(stmt):
+            if isinstance(node, _SCOPE_NODES + _COMPREHENSION_NODES):
+                return []
+            if isinstance(node, (ast.Global, ast.Nonlocal)):
+                return []
+            if isinstance(node, ast.Name) and node.id in _NAME_INTROSPECTION:
+                return []
+            if type(node).__name__.startswith("Match"):
+                return []
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                imported.update(alias.asname or alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+                if node.id not in stored:
+                    stored.append(node.id)
+            elif isinstance(node, ast.ExceptHandler) and node.name and node.name not in stored:
+                stored.append(node.name)
+    args = func.args
+    params = {a.arg for a in args.posonlyargs + args.args + args.kwonlyargs}
+    params.update(a.arg for a in (args.vararg, args.kwarg) if a is not None)
+    return [name for name in stored if name not in params and name not in imported]
+
+
+def rename_locals(tree: ast.AST) -> int:
+    """安全に判定できる関数のローカル変数を短い名前に置き換え、置き換えた数を返す。"""
+    reserved = collect_identifiers(tree)
+    renamed = 0
+    for func in ast.walk(tree):
+        if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        candidates = renamable_locals(func)
+        if not candidates:
+            continue
+        generator = short_names(reserved)
+        mapping: Dict[str, str] = {}
+        for name in candidates:
+            new_name = next(generator)
+            if len(new_name) < len(name):
+                mapping[name] = new_name
+        if not mapping:
+            continue
+        for stmt in func.body:
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.Name) and node.id in mapping:
+                    node.id = mapping[node.id]
+                elif isinstance(node, ast.ExceptHandler) and node.name in mapping:
+                    node.name = mapping[node.name]
+        renamed += len(mapping)
+    return renamed
+
+
+def compact_source(code: str) -> str:
+    """
+    トークン単位で組み直し、コメント・空行・不要な空白を落として 1 スペースインデントにする。
+    文字列リテラルや f-string の中身はそのまま残す。
+    """
+    lines = code.splitlines(keepends=True)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    def pos(point) -> int:
+        return offsets[point[0] - 1] + point[1]
+
+    fstring_start = getattr(tokenize, "FSTRING_START", None)
+    fstring_end = getattr(tokenize, "FSTRING_END", None)
+    skip = {tokenize.NL, tokenize.COMMENT, tokenize.ENCODING, tokenize.ENDMARKER}
+
+    out: List[str] = []
+    current: List[str] = []
+    depth = 0
+    fstring_depth = 0
+    prev_end: Optional[int] = None
+    prev_text = ""
+    for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+        if tok.type == tokenize.INDENT:
+            depth += 1
+            continue
+        if tok.type == tokenize.DEDENT:
+            depth -= 1
+            continue
+        if tok.type in skip:
+            continue
+        if tok.type == tokenize.NEWLINE:
+            if current:
+                out.append(" " * depth + "".join(current))
+            current = []
+            prev_end = None
+            prev_text = ""
+            continue
+        start, end = pos(tok.start), pos(tok.end)
+        text = code[start:end]
+        if prev_end is not None:
+            if fstring_depth:
+                current.append(code[prev_end:start])
+            elif _needs_space(prev_text, text):
+                current.append(" ")
+        current.append(text)
+        if tok.type == fstring_start:
+            fstring_depth += 1
+        elif tok.type == fstring_end:
+            fstring_depth -= 1
+        prev_end = end
+        prev_text = text
+    return "\n".join(out) + "\n"
+
+
+def _needs_space(prev_text: str, text: str) -> bool:
+    def is_word(char: str) -> bool:
+        return char.isalnum() or char == "_"
+
+    return bool(prev_text) and bool(text) and is_word(prev_text[-1]) and is_word(text[0])
+
+
+def ast_equivalent(expected: ast.AST, actual: ast.AST) -> bool:
+    """
+    2 つの AST が、関数ごとのローカル変数名の付け替えを除いて同一かどうかを判定する。
+    名前の対応は関数スコープ単位の 1 対 1 対応でなければならない。
+    """
+
+    def same_name(a: str, b: str, scope) -> bool:
+        forward, backward = scope
+        if a in forward or b in backward:
+            return forward.get(a) == b and backward.get(b) == a
+        forward[a] = b
+        backward[b] = a
+        return True
+
+    def compare(x, y, scope) -> bool:
+        if type(x) is not type(y):
+            return False
+        if isinstance(x, list):
+            return len(x) == len(y) and all(compare(a, b, scope) for a, b in zip(x, y))
+        if not isinstance(x, ast.AST):
+            return x == y
+        if isinstance(x, ast.Name):
+            return same_name(x.id, y.id, scope) and compare(x.ctx, y.ctx, scope)
+        inner = scope
+        if isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if x.name != y.name:
+                return False
+            if not compare(x.decorator_list, y.decorator_list, scope):
+                return False
+            inner = ({}, {})
+        for field in x._fields:
+            if isinstance(x, (ast.FunctionDef, ast.AsyncFunctionDef)) and field in ("name", "decorator_list"):
+                continue
+            a, b = getattr(x, field, None), getattr(y, field, None)
+            if isinstance(x, ast.ExceptHandler) and field == "name":
+                if (a is None) != (b is None) or (a is not None and not same_name(a, b, inner)):
+                    return False
+                continue
+            if not compare(a, b, inner):
+                return False
+        return True
+
+    return compare(expected, actual, ({}, {}))
+
+
+def minify_source(code: str, rename: bool = True) -> str:
+    """
+    Hub 用コードを minify して返す。
+    docstring 除去後の元 AST と minify 後の AST が一致しない場合は MinifyError。
+    """
+    expected = strip_docstrings(ast.parse(code))
+    tree = strip_docstrings(ast.parse(code))
+    if rename:
+        rename_locals(tree)
+    minified = compact_source(ast.unparse(tree))
+    if not ast_equivalent(expected, ast.parse(minified)):
+        raise MinifyError("minified code is not equivalent to the original AST")
+    return minified
+
+
+def report_size(before: str, after: str) -> None:
+    """minify 前後のバイト数を表示する。"""
+    size_before = len(before.encode("utf-8"))
+    size_after = len(after.encode("utf-8"))
+    saved = size_before - size_after
+    ratio = (saved / size_before * 100) if size_before else 0.0
+    print(f"Minify: {size_before} -> {size_after} bytes (-{saved} bytes, -{ratio:.1f}%)")
@@ -0,0 +1,574 @@
+"""
+PC側で実行する最適化パス。build.py から呼ばれる。
+結合後の Hub 用コード全体を 1 つの AST として解析し、Hub に送る前に無駄を削る。
+
+- eliminate_dead_code: 各 run の run() / sensor_logger_task と initialize_robot から
+  到達できない関数・メソッドを取り除く（--layout modules では、ほかのモジュールから使われる名前を渡してモジュールごとに行う）
+- drop_unused_imports: --layout modules の run モジュールが共有 setup から import する名前を、使うものだけにする
+- fold_settings: mission 内のリテラル設定 dict（straight_settings など）の `**` 展開を
+  定数キーワード引数に置き換え、直前と同じ引数の settings() 呼び出しを消す
+
+書き換えは行単位の置き換えで行い、コメントや整形はそのまま残す。
+"""
+
+import ast
+import copy
+import keyword
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+FACTORY_PREFIX = "_make_"
+
+# settings() の状態を変えないと分かっている呼び出し（直前と同じ settings() を消すときの判定用）
+# straight/turn は speed/rate/acceleration を渡すと終了時に既定値へ戻すので、距離・角度と timeout のみ許可する
+DRIVE_METHODS = {"straight", "turn"}
+MOTOR_METHODS = {"run_angle", "run_target", "run_time", "run", "stop", "brake", "hold", "reset_angle"}
+PURE_FUNCTIONS = {"print", "wait"}
+
+
+def is_binding(stmt: ast.stmt) -> Optional[str]:
+    """
+    build.py の mission binding（`try: m.name = name / except NameError: pass`）なら name を返す。
+    """
+    if not isinstance(stmt, ast.Try) or len(stmt.body) != 1 or stmt.orelse or stmt.finalbody:
+        return None
+    assign = stmt.body[0]
+    if not isinstance(assign, ast.Assign) or len(assign.targets) != 1:
+        return None
+    target = assign.targets[0]
+    if not (isinstance(target, ast.Attribute) and isinstance(assign.value, ast.Name)):
+        return None
+    if target.attr != assign.value.id:
+        return None
+    handlers = stmt.handlers
+    if len(handlers) != 1 or not isinstance(handlers[0].type, ast.Name) or handlers[0].type.id != "NameError":
+        return None
+    return assign.value.id
+
+
+def name_tuple(node: Optional[ast.AST]) -> Optional[List[str]]:
+    """名前だけのタプルなら名前一覧を返す。"""
+    if not isinstance(node, ast.Tuple) or not all(isinstance(elt, ast.Name) for elt in node.elts):
+        return None
+    return [elt.id for elt in node.elts]
+
+
+class Scope:
+    """モジュール直下、または _make_* ファクトリ 1 つ分の解析状態。"""
+
+    def __init__(self, label: str, node: ast.AST):
+        self.label = label
+        self.node = node
+        self.active = False
+        self.used: Set[str] = set()
+        self.bound: Set[str] = set()
+        self.defs: Dict[str, List[ast.stmt]] = {}
+        self.live: Set[int] = set()
+        self.unpacks: List[Tuple[ast.Assign, str]] = []
+        self.setup_return: Optional[ast.Return] = None
+
+    @property
+    def body(self) -> List[ast.stmt]:
+        return self.node.body
+
+
+def scope_label(name: str) -> str:
+    label = name[len(FACTORY_PREFIX):]
+    if label.startswith("SETUP_"):
+        return f"setup _{label}"
+    return label
+
+
+def is_def(stmt: ast.stmt) -> bool:
+    return isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+
+
+LITERAL_NODES = (ast.Constant, ast.Dict, ast.List, ast.Tuple, ast.Set, ast.UnaryOp, ast.BinOp, ast.operator, ast.unaryop, ast.Load)
+
+
+def constant_name(stmt: ast.stmt) -> Optional[str]:
+    """`NAME = リテラル`（数値・文字列・dict など、呼び出しや名前を含まない値）なら NAME を返す。"""
+    if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1 or not isinstance(stmt.targets[0], ast.Name):
+        return None
+    if not all(isinstance(node, LITERAL_NODES) for node in ast.walk(stmt.value)):
+        return None
+    return stmt.targets[0].id
+
+
+def removable_name(stmt: ast.stmt) -> Optional[str]:
+    """使われなければ取り除ける文（関数・クラス・リテラルの定数）の名前。"""
+    return stmt.name if is_def(stmt) else constant_name(stmt)
+
+
+def is_dunder(name: str) -> bool:
+    return name.startswith("__") and name.endswith("__")
+
+
+class DeadCodeEliminator:
+    """
+    名前ベースの保守的な到達解析。
+    - 関数名・クラス名と、リテラルだけの定数（LIFT_SPEED = 500 など）はスコープ（モジュール / ファクトリ）ごとに追跡する
+    - 属性名と識別子形式の文字列定数（hasattr/getattr 用）は全体で共有し、
+      同名のメソッド・関数はすべて生存扱いにする
+    """
+
+    def __init__(self, tree: ast.Module, module_label: str = "module", roots: Iterable[str] = (), attrs: Iterable[str] = ()):
+        self.tree = tree
+        self.attrs: Set[str] = set(attrs)
+        self.module = Scope(module_label, tree)
+        self.module.active = True
+        self.module.used.update(roots)
+        self.factories: Dict[str, Scope] = {}
+        self.setup_scopes: Dict[str, Scope] = {}
+        for stmt in tree.body:
+            if isinstance(stmt, ast.FunctionDef) and stmt.name.startswith(FACTORY_PREFIX):
+                self.factories[stmt.name] = Scope(scope_label(stmt.name), stmt)
+        for scope in self.scopes():
+            self._index(scope)
+        for stmt in tree.body:
+            if (
+                isinstance(stmt, ast.Assign)
+                and len(stmt.targets) == 1
+                and isinstance(stmt.targets[0], ast.Name)
+                and isinstance(stmt.value, ast.Call)
+                and isinstance(stmt.value.func, ast.Name)
+                and stmt.value.func.id in self.factories
+                and self.factories[stmt.value.func.id].setup_return is not None
+            ):
+                self.setup_scopes[stmt.targets[0].id] = self.factories[stmt.value.func.id]
+
+    def scopes(self) -> List[Scope]:
+        return [self.module] + list(self.factories.values())
+
+    def _index(self, scope: Scope) -> None:
+        for stmt in scope.body:
+            name = removable_name(stmt)
+            if name is not None:
+                scope.defs.setdefault(name, []).append(stmt)
+                scope.bound.add(name)
+            if isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                scope.bound.update(alias.asname or alias.name.split(".")[0] for alias in stmt.names)
+            elif isinstance(stmt, ast.Assign):
+                names = name_tuple(stmt.targets[0]) if len(stmt.targets) == 1 else None
+                if names is not None and isinstance(stmt.value, ast.Name):
+                    scope.unpacks.append((stmt, stmt.value.id))
+            if not is_def(stmt):
+                for node in ast.walk(stmt):
+                    if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                        scope.bound.add(node.id)
+        if scope is not self.module and scope.body:
+            last = scope.body[-1]
+            if isinstance(last, ast.Return) and name_tuple(last.value) is not None:
+                scope.setup_return = last
+
+    def _is_root_statement(self, scope: Scope, stmt: ast.stmt) -> bool:
+        if removable_name(stmt) is not None or is_binding(stmt) is not None:
+            return False
+        if stmt is scope.setup_return or any(stmt is unpack for unpack, _ in scope.unpacks):
+            return False
+        return True
+
+    def _use(self, scope: Scope, node: ast.AST, skip_methods: bool = False) -> None:
+        nodes = [node]
+        if isinstance(node, ast.ClassDef) and skip_methods:
+            nodes = node.bases + node.keywords + node.decorator_list
+            nodes += [stmt for stmt in node.body if not isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        for item in nodes:
+            for sub in ast.walk(item):
+                if isinstance(sub, ast.Name) and isinstance(sub.ctx, ast.Load):
+                    scope.used.add(sub.id)
+                elif isinstance(sub, ast.Attribute):
+                    self.attrs.add(sub.attr)
+                elif isinstance(sub, ast.Constant) and isinstance(sub.value, str):
+                    if sub.value.isidentifier() and not keyword.iskeyword(sub.value):
+                        self.attrs.add(sub.value)
+
+    def _activate(self, scope: Scope) -> None:
+        scope.active = True
+        for stmt in scope.body:
+            if self._is_root_statement(scope, stmt):
+                self._use(scope, stmt)
+
+    def run(self) -> None:
+        for stmt in self.tree.body:
+            if self._is_root_statement(self.module, stmt):
+                self._use(self.module, stmt)
+        changed = True
+        while changed:
+            changed = False
+            for scope in self.scopes():
+                if not scope.active:
+                    continue
+                for name, stmts in scope.defs.items():
+                    if name not in scope.used and name not in self.attrs:
+                        continue
+                    for stmt in stmts:
+                        if id(stmt) in scope.live:
+                            continue
+                        scope.live.add(id(stmt))
+                        changed = True
+                        if scope is self.module and name in self.factories:
+                            self._activate(self.factories[stmt.name])
+                            self._use(scope, ast.Module(body=stmt.decorator_list, type_ignores=[]))
+                        else:
+                            self._use(scope, stmt, skip_methods=True)
+                    for stmt in stmts:
+                        if isinstance(stmt, ast.ClassDef):
+                            changed |= self._visit_methods(scope, stmt)
+                changed |= self._propagate(scope)
+
+    def _visit_methods(self, scope: Scope, cls: ast.ClassDef) -> bool:
+        changed = False
+        for method in cls.body:
+            if not isinstance(method, (ast.FunctionDef, ast.AsyncFunctionDef)) or id(method) in scope.live:
+                continue
+            if is_dunder(method.name) or method.name in self.attrs:
+                scope.live.add(id(method))
+                self._use(scope, method)
+                changed = True
+        return changed
+
+    def _propagate(self, scope: Scope) -> bool:
+        """ファクトリ内で未定義の名前をモジュールへ、共有 setup から取り出した名前を setup へ伝える。"""
+        if scope is self.module:
+            return False
+        changed = False
+        unpacked: Dict[str, str] = {}
+        for stmt, ref in scope.unpacks:
+            for name in name_tuple(stmt.targets[0]):
+                unpacked[name] = ref
+        for name in list(scope.used):
+            setup = self.setup_scopes.get(unpacked.get(name, ""))
+            if setup is not None and name not in setup.used:
+                setup.used.add(name)
+                changed = True
+            if name not in scope.bound or name in unpacked:
+                target = self.module
+                if name not in target.used:
+                    target.used.add(name)
+                    changed = True
+        for _, ref in scope.unpacks:
+            if ref not in self.module.used:
+                self.module.used.add(ref)
+                changed = True
+        return changed
+
+    def removals(self) -> Tuple[List[Tuple[ast.AST, Optional[str]]], Dict[str, List[str]]]:
+        """(削除・置換する文, 置換テキスト) の一覧と、スコープごとの削除名レポートを返す。"""
+        edits: List[Tuple[ast.AST, Optional[str]]] = []
+        report: Dict[str, List[str]] = {}
+        for scope in self.scopes():
+            if scope is not self.module and not scope.active:
+                continue
+            removed: Set[str] = set()
+            for stmt in scope.body:
+                name = removable_name(stmt)
+                if name is not None and id(stmt) not in scope.live:
+                    removed.add(name)
+                    edits.append((stmt, None))
+                    report.setdefault(scope.label, []).append(name)
+                elif isinstance(stmt, ast.ClassDef):
+                    for method in stmt.body:
+                        if isinstance(method, (ast.FunctionDef, ast.AsyncFunctionDef)) and id(method) not in scope.live:
+                            edits.append((method, None))
+                            report.setdefault(scope.label, []).append(f"{stmt.name}.{method.name}")
+            still_bound = {removable_name(stmt) for stmt in scope.body if id(stmt) in scope.live}
+            removed -= still_bound
+            for stmt in scope.body:
+                name = is_binding(stmt)
+                if name is not None and name in removed:
+                    edits.append((stmt, None))
+            if scope.setup_return is not None and removed:
+                edits.extend(self._shrink_setup(scope, removed))
+        return edits, report
+
+    def _shrink_setup(self, scope: Scope, removed: Set[str]) -> List[Tuple[ast.AST, Optional[str]]]:
+        names = name_tuple(scope.setup_return.value)
+        keep = [index for index, name in enumerate(names) if name not in removed]
+        edits: List[Tuple[ast.AST, Optional[str]]] = []
+
+        def shrink(node: ast.Tuple) -> None:
+            node.elts = [node.elts[index] for index in keep]
+
+        shrink(scope.setup_return.value)
+        edits.append((scope.setup_return, ast.unparse(scope.setup_return)))
+        ref = next((ref for ref, setup in self.setup_scopes.items() if setup is scope), None)
+        for other in self.factories.values():
+            for stmt, unpack_ref in other.unpacks:
+                if unpack_ref == ref:
+                    shrink(stmt.targets[0])
+                    edits.append((stmt, ast.unparse(stmt)))
+        return edits
+
+
+def literal_kwargs(node: ast.AST) -> Optional[List[Tuple[str, ast.expr]]]:
+    """キーがすべて識別子、値がすべて定数の dict リテラルなら (キー, 値) の一覧を返す。"""
+    if not isinstance(node, ast.Dict):
+        return None
+    items: Dict[str, ast.expr] = {}
+    for key, value in zip(node.keys, node.values):
+        if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+            return None
+        if not key.value.isidentifier() or keyword.iskeyword(key.value):
+            return None
+        constant = value
+        if isinstance(constant, ast.UnaryOp) and isinstance(constant.op, (ast.USub, ast.UAdd)):
+            constant = constant.operand
+        if not isinstance(constant, ast.Constant):
+            return None
+        items.pop(key.value, None)
+        items[key.value] = value
+    return list(items.items())
+
+
+def fold_literal_kwargs(func: ast.AST) -> int:
+    """
+    関数内で 1 回だけ代入され、`f(**name)` の形でしか使われないリテラル dict を探し、
+    `**name` を定数のキーワード引数に展開する。すべて展開できたら代入文も消す。
+    展開した箇所の数を返す。
+    """
+    stores: Dict[str, int] = {}
+    nested: Set[str] = set()
+    declared: Set[str] = set()
+    for stmt in func.body:
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+                stores[node.id] = stores.get(node.id, 0) + 1
+            elif isinstance(node, (ast.Global, ast.Nonlocal)):
+                declared.update(node.names)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+                nested.update(sub.id for sub in ast.walk(node) if isinstance(sub, ast.Name))
+
+    candidates: Dict[str, Tuple[int, ast.Assign, List[Tuple[str, ast.expr]]]] = {}
+    for index, stmt in enumerate(func.body):
+        if not (isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)):
+            continue
+        name = stmt.targets[0].id
+        items = literal_kwargs(stmt.value)
+        if items is None or stores.get(name) != 1 or name in nested or name in declared:
+            continue
+        candidates[name] = (stmt.end_lineno, stmt, items)
+
+    expansions: Dict[str, List[Tuple[ast.Call, ast.keyword]]] = {name: [] for name in candidates}
+    for stmt in func.body:
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Call):
+                for kw in node.keywords:
+                    if kw.arg is None and isinstance(kw.value, ast.Name) and kw.value.id in expansions:
+                        expansions[kw.value.id].append((node, kw))
+    for stmt in func.body:
+        for node in ast.walk(stmt):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id in candidates:
+                used_as_kwargs = any(kw.value is node for _, kw in expansions[node.id])
+                if not used_as_kwargs or node.lineno <= candidates[node.id][0]:
+                    expansions.pop(node.id, None)
+                    candidates.pop(node.id, None)
+
+    folded = 0
+    for name, uses in expansions.items():
+        _, assign, items = candidates[name]
+        remaining = len(uses)
+        for call, kw in uses:
+            explicit = {other.arg for other in call.keywords if other.arg is not None}
+            if explicit & {key for key, _ in items}:
+                continue
+            position = call.keywords.index(kw)
+            call.keywords[position : position + 1] = [
+                ast.keyword(arg=key, value=ast.copy_location(copy.deepcopy(value), kw)) for key, value in items
+            ]
+            remaining -= 1
+            folded += 1
+        if remaining == 0:
+            func.body.remove(assign)
+    if not func.body:
+        func.body.append(ast.Pass())
+    return folded
+
+
+def settings_call(stmt: ast.stmt) -> Optional[Tuple[str, str]]:
+    """`recv.settings(k=定数, ...)` だけの文なら (recv, 引数の比較キー) を返す。"""
+    if not (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call)):
+        return None
+    call = stmt.value
+    func = call.func
+    if not (isinstance(func, ast.Attribute) and func.attr == "settings" and isinstance(func.value, ast.Name)):
+        return None
+    if call.args or any(kw.arg is None for kw in call.keywords):
+        return None
+    if literal_kwargs(ast.Dict(keys=[ast.Constant(kw.arg) for kw in call.keywords], values=[kw.value for kw in call.keywords])) is None:
+        return None
+    key = sorted((kw.arg, ast.dump(kw.value)) for kw in call.keywords)
+    return func.value.id, repr(key)
+
+
+def keeps_settings(stmt: ast.stmt) -> bool:
+    """DriveBase の settings() の値を変えないと分かっている文かどうか。"""
+    if not isinstance(stmt, ast.Expr):
+        return False
+    value = stmt.value.value if isinstance(stmt.value, ast.Await) else stmt.value
+    if not isinstance(value, ast.Call):
+        return False
+    func = value.func
+    if isinstance(func, ast.Name):
+        return func.id in PURE_FUNCTIONS
+    if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)):
+        return False
+    if func.attr in DRIVE_METHODS:
+        return len(value.args) == 1 and all(kw.arg == "timeout" for kw in value.keywords)
+    return func.attr in MOTOR_METHODS
+
+
+def drop_redundant_settings(body: List[ast.stmt]) -> int:
+    """
+    同じブロック内で、直前の settings() と同じ引数の settings() を消す。
+    間に settings を変えうる文（keeps_settings に当てはまらない文）があれば比較をやり直す。
+    消した数を返す。
+    """
+    removed = 0
+    last: Dict[str, str] = {}
+    kept: List[ast.stmt] = []
+    for stmt in body:
+        call = settings_call(stmt)
+        if call is not None:
+            receiver, key = call
+            if last.get(receiver) == key:
+                removed += 1
+                continue
+            last = {receiver: key}
+        elif not keeps_settings(stmt):
+            last = {}
+        kept.append(stmt)
+    body[:] = kept or [ast.Pass()]
+    for stmt in body:
+        for field in ("body", "orelse", "finalbody"):
+            block = getattr(stmt, field, None)
+            if isinstance(block, list) and block and isinstance(block[0], ast.stmt):
+                removed += drop_redundant_settings(block)
+        for handler in getattr(stmt, "handlers", []):
+            removed += drop_redundant_settings(handler.body)
+    return removed
+
+
+def fold_settings(tree: ast.AST) -> Tuple[int, int]:
+    """
+    すべての関数に fold_literal_kwargs と drop_redundant_settings をかける。
+    (展開した `**` の数, 消した settings() の数) を返す。
+    """
+    folded = removed = 0
+    for func in [node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))]:
+        folded += fold_literal_kwargs(func)
+        removed += drop_redundant_settings(func.body)
+    return folded, removed
+
+
+def apply_line_edits(
+    code: str, tree: ast.Module, edits: List[Tuple[ast.AST, Optional[str]]]
+) -> Tuple[str, List[int]]:
+    """
+    文単位の削除・置換を行単位で適用する。
+    ブロックの文がすべて消える場合は pass を残す。
+    (新しいコード, 新しい各行の元の行番号) を返す（置き換えた行は元の文の先頭行）。
+    """
+    lines = code.splitlines()
+    numbers = list(range(1, len(lines) + 1))
+    targets = {id(node): replacement for node, replacement in edits}
+    spans: List[Tuple[int, int, List[str]]] = []
+
+    for parent in ast.walk(tree):
+        for field in ("body", "orelse", "finalbody"):
+            block = getattr(parent, field, None)
+            if not isinstance(block, list) or not block or not isinstance(block[0], ast.stmt):
+                continue
+            hit = [stmt for stmt in block if id(stmt) in targets]
+            if not hit:
+                continue
+            all_removed = all(targets[id(stmt)] is None for stmt in hit) and len(hit) == len(block)
+            for index, stmt in enumerate(hit):
+                start = min([stmt.lineno] + [dec.lineno for dec in getattr(stmt, "decorator_list", [])])
+                indent = " " * stmt.col_offset
+                replacement = targets[id(stmt)]
+                if replacement is not None:
+                    new_lines = [indent + line for line in replacement.splitlines()]
+                elif all_removed and index == 0 and not isinstance(parent, ast.Module):
+                    new_lines = [indent + "pass"]
+                else:
+                    new_lines = []
+                spans.append((start, stmt.end_lineno, new_lines))
+
+    for start, end, new_lines in sorted(spans, key=lambda span: span[0], reverse=True):
+        lines[start - 1 : end] = new_lines
+        numbers[start - 1 : end] = [start] * len(new_lines)
+    return "\n".join(lines) + "\n", numbers
+
+
+def eliminate_dead_code(
+    code: str, roots: Iterable[str] = (), attrs: Iterable[str] = (), label: str = "module"
+) -> Tuple[str, Dict[str, List[str]], List[int]]:
+    """
+    到達できない関数・メソッドを取り除いたコードと、スコープごとの削除一覧、
+    新しい各行の元の行番号（ソースマップ用）を返す。
+    roots / attrs は、ほかのモジュールから名前として / 属性として使われる名前（--layout modules 用）。
+    label はモジュール直下のスコープの削除一覧での名前。
+    """
+    tree = ast.parse(code)
+    eliminator = DeadCodeEliminator(tree, label, roots=roots, attrs=attrs)
+    eliminator.run()
+    edits, report = eliminator.removals()
+    if not edits:
+        return code, report, list(range(1, len(code.splitlines()) + 1))
+    new_code, numbers = apply_line_edits(code, tree, edits)
+    return new_code, report, numbers
+
+
+def used_names(code: str) -> Tuple[Set[str], Set[str]]:
+    """
+    code の中で読まれている名前と、属性名・識別子形式の文字列定数（getattr / globals() 用）を返す。
+    --layout modules で、あるモジュールがほかのモジュールの何を使うかを集めるのに使う。
+    """
+    names: Set[str] = set()
+    attrs: Set[str] = set()
+    for node in ast.walk(ast.parse(code)):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            attrs.add(node.attr)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            if node.value.isidentifier() and not keyword.iskeyword(node.value):
+                attrs.add(node.value)
+    return names, attrs
+
+
+def drop_unused_imports(code: str, module: str, keep: Iterable[str] = ()) -> Tuple[str, List[str], List[int]]:
+    """
+    `from module import ...` のうち、code の中でも keep（ほかのモジュールが属性として使う名前）でも
+    使われていない名前を外す。残す名前がなければ文ごと消す。
+    (新しいコード, import している名前, 新しい各行の元の行番号) を返す。
+    """
+    tree = ast.parse(code)
+    names, attrs = used_names(code)
+    wanted = names | attrs | set(keep)
+    edits: List[Tuple[ast.AST, Optional[str]]] = []
+    imported: List[str] = []
+    for stmt in tree.body:
+        if not isinstance(stmt, ast.ImportFrom) or stmt.module != module:
+            continue
+        aliases = [alias for alias in stmt.names if (alias.asname or alias.name) in wanted]
+        imported.extend(alias.asname or alias.name for alias in aliases)
+        if len(aliases) == len(stmt.names):
+            continue
+        stmt.names = aliases
+        edits.append((stmt, ast.unparse(stmt) if aliases else None))
+    if not edits:
+        return code, imported, list(range(1, len(code.splitlines()) + 1))
+    new_code, numbers = apply_line_edits(code, tree, edits)
+    return new_code, imported, numbers
+
+
+def print_dead_code_report(report: Dict[str, List[str]]) -> None:
+    total = sum(len(names) for names in report.values())
+    print(f"Dead code: removed {total} function(s)/method(s)/constant(s)")
+    for label, names in report.items():
+        counts: Dict[str, int] = {}
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+        items = [name if count == 1 else f"{name} (x{count})" for name, count in counts.items()]
+        print(f"  {label}: {', '.join(items)}")
@@ -19,10 +19,10 @@
 # ===== ライブラリのインポート =====
 # LEGOロボットを動かすために必要な道具を読み込みます
 from pybricks.hubs import PrimeHub  # ロボットの「脳みそ」（ハブ）を使うための道具
-from pybricks.parameters import Axis, Direction, Port  # ポート、軸、方向などの設定
+from pybricks.parameters import Axis, Direction, Port, Stop  # ポート、軸、方向、止まり方などの設定
 from pybricks.pupdevices import Motor  # モーターを使うための道具
 from pybricks.robotics import DriveBase  # ロボットの移動機能を使うための道具
-from pybricks.tools import StopWatch, wait
+from pybricks.tools import StopWatch, multitask, wait
 
 # ===== デフォルトの速度・加速度設定 =====
 # 各runファイルから共通で使用できる設定値
@@ -36,24 +36,45 @@ DEFAULT_TURN_SETTINGS = {"turn_rate": 240, "turn_acceleration": 850}
 # カーブ時の設定
 DEFAULT_CURVE_SETTINGS = {"straight_speed": 240, "straight_acceleration": 800}
 
+# ===== リフト（アーム）の位置 =====
+# スタート時の位置（initialize_robot() でモーター角度を 0 にした位置）を DOWN とした角度（度）
+# アタッチメントに合わせて直す。使う mission で robot.add_lift(right_lift, RIGHT_LIFT_POSITIONS) と登録してから、
+# robot.move_lift(right_lift, "UP") のように名前で使う（使わない run の Hub 用コードには入らない）
+LEFT_LIFT_POSITIONS = {"DOWN": 0, "CARRY": -150, "UP": -360}
+RIGHT_LIFT_POSITIONS = {"DOWN": 0, "CARRY": -150, "UP": -360}
+
+# リフトを動かす速度（deg/s）と、目標の位置に着いているとみなす角度のずれ（度）
+LIFT_SPEED = 500
+LIFT_TOLERANCE = 5
+
 
 async def run_with_timeout(start_fn, done_fn, stop_fn, timeout_ms, poll_ms=10):
     """
-    非同期ループで完了を監視し、タイムアウトで停止する共通関数。
+    動きとタイマーを multitask(race=True) で同時に待ち、先に終わった方で決める共通関数。
+    start_fn は動きの awaitable を返す（wait=False を付けない）。正常完了で True、タイムアウトで停止して False。
+    start_fn が何も返さない（wait=False で開始した）ときだけ、done_fn を poll_ms ごとに見る。
     """
-    start_fn()
-    timer = StopWatch()
-    timer.reset()
-
-    while timer.time() < timeout_ms:
-        if done_fn():
-            return True
-        await wait(poll_ms)
-
+    move = start_fn()
+    if move is None:
+        move = _wait_done(done_fn, poll_ms)
+    finished, _ = await multitask(_completed(move), wait(timeout_ms), race=True)
+    if finished:
+        return True
     stop_fn()
     return False
 
 
+async def _completed(move):
+    """move を待ち終えたら True（race で負けて止められたときは multitask が None を返す）"""
+    await move
+    return True
+
+
+async def _wait_done(done_fn, poll_ms):
+    while not done_fn():
+        await wait(poll_ms)
+
+
 def apply_curve_settings(set_settings_fn, speed=None, acceleration=None):
     """
     カーブ用の速度・加速度設定を適用するユーティリティ。
@@ -67,6 +88,95 @@ def apply_curve_settings(set_settings_fn, speed=None, acceleration=None):
         set_settings_fn(**params)
 
 
+def split_segment(segment):
+    """
+    Robot.sequence() の 1 つの動きを (種類, 引数, オプション) に分ける。
+    ("straight", 300) / ("turn", 90, {"rate": 300}) / ("curve", 200, 45, {"hold": True}) の形。
+    """
+    if isinstance(segment[-1], dict):
+        return segment[0], segment[1:-1], dict(segment[-1])
+    return segment[0], segment[1:], {}
+
+
+def segment_overrides(kind, options):
+    """
+    straight() / turn() / curve() が、options のスピード指定（speed, rate, acceleration）で変える設定。
+    指定がなければ {}（動いたあとに戻す設定もない）。
+    """
+    acceleration = options.get("acceleration")
+    if kind == "turn":
+        rate = options.get("rate")
+        if rate is None and acceleration is None:
+            return {}
+        return {
+            "turn_rate": rate if rate is not None else DEFAULT_TURN_SETTINGS["turn_rate"],
+            "turn_acceleration": (
+                acceleration if acceleration is not None else DEFAULT_TURN_SETTINGS["turn_acceleration"]
+            ),
+        }
+    speed = options.get("speed")
+    if kind == "curve":
+        changed = {}
+        if speed is not None:
+            changed["straight_speed"] = speed
+        if acceleration is not None:
+            changed["straight_acceleration"] = acceleration
+        return changed
+    if speed is None and acceleration is None:
+        return {}
+    return {
+        "straight_speed": speed if speed is not None else DEFAULT_STRAIGHT_SETTINGS["straight_speed"],
+        "straight_acceleration": (
+            acceleration if acceleration is not None else DEFAULT_STRAIGHT_SETTINGS["straight_acceleration"]
+        ),
+    }
+
+
+def blend_stop(segment, next_segment, settings, next_settings):
+    """
+    次の動きにつなぐときの止まり方。settings / next_settings はそれぞれの動きで DriveBase に入っている設定。
+    同じ種類・同じ向きで設定も同じ動きが続くときは止まらずにつなぎ（Stop.NONE）、
+    向きや種類が変わるときは減速してから保持せずに次へ進む（Stop.COAST）。
+    設定が変わるとき（スピード指定の有無や値が違う）も Stop.COAST にする。
+    DriveBase.settings() は止まっているときしか変えられないので、動いたままではつながない。
+    """
+    if settings != next_settings:
+        return Stop.COAST
+    kind, args, _ = split_segment(segment)
+    next_kind, next_args, _ = split_segment(next_segment)
+    if kind == next_kind and all((a < 0) == (b < 0) for a, b in zip(args, next_args)):
+        return Stop.NONE
+    return Stop.COAST
+
+
+# ===== モーターの動きのハンドル =====
+class MotorMove:
+    """
+    Robot.start_motor() で動かし始めたモーターのハンドル
+
+    done() で終わったかを調べ、await で終わるまで待てます。
+    待っている間も、ほかのタスク（走行など）は進みます。
+    """
+
+    def __init__(self, motor):
+        self.motor = motor
+
+    def done(self):
+        """動きが終わったかどうか"""
+        return self.motor.done()
+
+    def stop(self):
+        """動きを途中で止める"""
+        self.motor.stop()
+
+    def __iter__(self):
+        # 終わるまで 1 回ずつ順番をゆずる（wait() のように時間を決めて眠らない）
+        while not self.motor.done():
+            yield
+
+    __await__ = __iter__
+
+
 # ===== ハブの設定をする関数 =====
 def setup_hub():
     """
@@ -131,13 +241,50 @@ class Robot:
     await robot.curve(200, 45, speed=150)       # 150mm/sでカーブ
 
     スピードを指定しない場合は、デフォルト設定が使われます。
+
+    【速度設定の送り方】
+    settings() やスピード指定で変えた値は覚えておくだけで、次に動くときに
+    DriveBase に入っている値と違うものだけをまとめて送ります。
+    同じ値を何度指定しても、DriveBase.settings() は呼ばれません。
+
+    いくつかの動きを同じスピードで続けたいときは push_settings() で積み、
+    終わったら pop_settings() で戻します：
+    robot.push_settings(straight_speed=150)
+    await robot.straight(100)
+    await robot.straight(-100)
+    robot.pop_settings()
     """
 
     def __init__(self, drivebase):
-        """DriveBaseを受け取って初期化"""
+        """DriveBaseを受け取って初期化（DriveBaseにはデフォルト設定が入っていること）"""
         self._robot = drivebase
-
-    async def straight(self, distance, speed=None, acceleration=None, timeout=None):
+        # DriveBase に今入っている設定と、次に動くときに入っているべき設定
+        self._applied = dict(DEFAULT_STRAIGHT_SETTINGS, **DEFAULT_TURN_SETTINGS)
+        self._wanted = dict(self._applied)
+        # push_settings() で積んだ設定。一番下はデフォルト設定
+        # スピード指定つきの動きが終わると、一番上の設定に戻る
+        self._overrides = [dict(self._applied)]
+        # sequence() の名前ごとの (つないだか, 動きごとの時間 ms)。つなぐ/つながないを比べて短縮時間を表示する
+        self._sequence_times = {}
+        # add_lift() で登録したリフトの位置の表と、最後に動かした目標の角度（どちらもモーターの id() がキー）
+        self._lift_positions = {}
+        self._lift_targets = {}
+
+    def _sync_settings(self):
+        """入っているべき設定のうち、DriveBase と違う値だけを送る"""
+        applied = self._applied
+        changed = {key: value for key, value in self._wanted.items() if applied.get(key) != value}
+        if changed:
+            self._robot.settings(**changed)
+            applied.update(changed)
+
+    def _restore_settings(self, defaults):
+        """スピード指定つきの動きのあと、defaults のキーを積んだ設定の一番上に戻す"""
+        top = self._overrides[-1]
+        for key in defaults:
+            self._wanted[key] = top[key]
+
+    async def straight(self, distance, speed=None, acceleration=None, timeout=None, then=Stop.HOLD):
         """
         直進する（スピード・タイムアウト指定可能）
 
@@ -146,10 +293,11 @@ class Robot:
         - speed: 速度（mm/s）。省略時はデフォルト設定
         - acceleration: 加速度（mm/s²）。省略時はデフォルト設定
         - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+        - then: 止まり方（Stop.HOLD など）。省略時はその場で止まって保持
         """
         # スピード設定
         if speed is not None or acceleration is not None:
-            self._robot.settings(
+            self.settings(
                 straight_speed=(
                     speed if speed is not None else DEFAULT_STRAIGHT_SETTINGS["straight_speed"]
                 ),
@@ -160,23 +308,24 @@ class Robot:
                 ),
             )
 
+        self._sync_settings()
         if timeout is not None:
             # タイムアウト付きで実行
             await run_with_timeout(
-                start_fn=lambda: self._robot.straight(distance, wait=False),
+                start_fn=lambda: self._robot.straight(distance, then=then),
                 done_fn=self._robot.done,
                 stop_fn=self._robot.stop,
                 timeout_ms=timeout,
             )
         else:
             # 通常の実行（完了まで待つ）
-            await self._robot.straight(distance)
+            await self._robot.straight(distance, then=then)
 
-        # デフォルト設定に戻す
+        # デフォルト設定（push_settings() で積んだ設定があればそれ）に戻す。送るのは次に動くとき
         if speed is not None or acceleration is not None:
-            self._robot.settings(**DEFAULT_STRAIGHT_SETTINGS)
+            self._restore_settings(DEFAULT_STRAIGHT_SETTINGS)
 
-    async def turn(self, angle, rate=None, acceleration=None, timeout=None):
+    async def turn(self, angle, rate=None, acceleration=None, timeout=None, then=Stop.HOLD):
         """
         その場で回転する（スピード・タイムアウト指定可能）
 
@@ -185,10 +334,11 @@ class Robot:
         - rate: 回転速度（deg/s）。省略時はデフォルト設定
         - acceleration: 回転加速度（deg/s²）。省略時はデフォルト設定
         - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+        - then: 止まり方（Stop.HOLD など）。省略時はその場で止まって保持
         """
         # スピード設定
         if rate is not None or acceleration is not None:
-            self._robot.settings(
+            self.settings(
                 turn_rate=rate if rate is not None else DEFAULT_TURN_SETTINGS["turn_rate"],
                 turn_acceleration=(
                     acceleration
@@ -197,23 +347,24 @@ class Robot:
                 ),
             )
 
+        self._sync_settings()
         if timeout is not None:
             # タイムアウト付きで実行
             await run_with_timeout(
-                start_fn=lambda: self._robot.turn(angle, wait=False),
+                start_fn=lambda: self._robot.turn(angle, then=then),
                 done_fn=self._robot.done,
                 stop_fn=self._robot.stop,
                 timeout_ms=timeout,
             )
         else:
             # 通常の実行
-            await self._robot.turn(angle)
+            await self._robot.turn(angle, then=then)
 
-        # デフォルト設定に戻す
+        # デフォルト設定（push_settings() で積んだ設定があればそれ）に戻す。送るのは次に動くとき
         if rate is not None or acceleration is not None:
-            self._robot.settings(**DEFAULT_TURN_SETTINGS)
+            self._restore_settings(DEFAULT_TURN_SETTINGS)
 
-    async def curve(self, radius, angle, speed=None, acceleration=None, timeout=None):
+    async def curve(self, radius, angle, speed=None, acceleration=None, timeout=None, then=Stop.HOLD):
         """
         カーブする（スピード・タイムアウト指定可能）
 
@@ -223,29 +374,100 @@ class Robot:
         - speed: 速度（mm/s）。省略時はデフォルト設定
         - acceleration: 加速度（mm/s²）。省略時はデフォルト設定
         - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+        - then: 止まり方（Stop.HOLD など）。省略時はその場で止まって保持
         """
         # スピード設定（指定があれば上書き）
         apply_curve_settings(
-            self._robot.settings,
+            self.settings,
             speed if speed is not None else None,
             acceleration if acceleration is not None else None,
         )
 
+        self._sync_settings()
         if timeout is not None:
             # タイムアウト付きで実行
             await run_with_timeout(
-                start_fn=lambda: self._robot.curve(radius, angle, wait=False),
+                start_fn=lambda: self._robot.curve(radius, angle, then=then),
                 done_fn=self._robot.done,
                 stop_fn=self._robot.stop,
                 timeout_ms=timeout,
             )
         else:
             # 通常の実行
-            await self._robot.curve(radius, angle)
+            await self._robot.curve(radius, angle, then=then)
 
-        # デフォルト設定に戻す
+        # デフォルト設定（push_settings() で積んだ設定があればそれ）に戻す。送るのは次に動くとき
         if speed is not None or acceleration is not None:
-            self._robot.settings(**DEFAULT_STRAIGHT_SETTINGS)
+            self._restore_settings(DEFAULT_STRAIGHT_SETTINGS)
+
+    async def sequence(self, segments, blend=True, label="sequence"):
+        """
+        いくつかの動きを続けて行う（動きの間で止まらずにつなぐ）
+
+        【パラメータ】
+        - segments: 動きのリスト。1 つの動きは ("straight", 距離) / ("turn", 角度) / ("curve", 半径, 角度)。
+          最後に dict を付けると、straight() などのオプション（speed, rate, acceleration, timeout）を渡せる。
+          {"hold": True} を付けた動きは、そこで止まって保持する（ミッションモデルに当てるときなど）
+        - blend: False にすると、すべての動きで止まって保持する（今までと同じ動き。時間の比較用）
+        - label: 時間を表示するときの名前。同じ名前で blend を変えて走らせると、短縮した時間を表示する
+
+        【使用例】
+        await robot.sequence([
+            ("straight", 300),
+            ("straight", 200),                  # 同じ向き・同じ設定なので止まらずにつなぐ
+            ("straight", 200, {"speed": 200}),  # スピードが変わるので、前の動きは COAST で止めてから設定を変える
+            ("turn", 90),
+            ("straight", 150, {"hold": True}),
+        ], label="m10")
+
+        DriveBase.settings() は動いている間は変えられないので、止まらずにつなぐのは
+        次の動きで設定が変わらないときだけ。最後の動きは必ず止まって保持する。動きごとの時間（ms）のリストを返す。
+        """
+        plan = self._sequence_settings(segments)
+        times = []
+        last = len(segments) - 1
+        for index, segment in enumerate(segments):
+            kind, args, options = split_segment(segment)
+            then = Stop.HOLD
+            if not options.pop("hold", False) and blend and index < last:
+                then = blend_stop(segment, segments[index + 1], plan[index], plan[index + 1])
+            timer = StopWatch()
+            await getattr(self, kind)(*args, then=then, **options)
+            times.append(timer.time())
+        self._report_sequence(label, blend, segments, times)
+        return times
+
+    def _sequence_settings(self, segments):
+        """
+        sequence() の動きごとに、その動きの間 DriveBase に入っている設定を返す。
+        straight() などと同じく、スピード指定つきの動きのあとは積んだ設定の一番上に戻る。
+        """
+        wanted = dict(self._wanted)
+        top = self._overrides[-1]
+        plan = []
+        for segment in segments:
+            kind, _, options = split_segment(segment)
+            changed = segment_overrides(kind, options)
+            wanted.update(changed)
+            plan.append(dict(wanted))
+            if changed:
+                for key in DEFAULT_TURN_SETTINGS if kind == "turn" else DEFAULT_STRAIGHT_SETTINGS:
+                    wanted[key] = top[key]
+        return plan
+
+    def _report_sequence(self, label, blend, segments, times):
+        """sequence() の時間を表示する。前回 blend を変えて走らせていれば、動きごとの短縮時間も表示する"""
+        previous = self._sequence_times.get(label)
+        self._sequence_times[label] = (blend, times)
+        mode = "blend" if blend else "hold"
+        print(f"[SEQ] {label}: {len(times)} segments, {sum(times):.0f} ms ({mode})")
+        if previous is None or previous[0] == blend or len(previous[1]) != len(times):
+            return
+        held, blended = (previous[1], times) if blend else (times, previous[1])
+        for index, segment in enumerate(segments):
+            kind, args, _ = split_segment(segment)
+            print(f"  {index + 1} {kind} {' '.join(str(arg) for arg in args)}: {held[index] - blended[index]:.0f} ms saved")
+        print(f"[SEQ] {label}: {sum(held) - sum(blended):.0f} ms saved in total")
 
     async def run_motor(self, motor, speed, angle, timeout=None):
         """
@@ -261,10 +483,11 @@ class Robot:
         await robot.run_motor(right_wheel, 200, 140, timeout=1500)
         await robot.run_motor(left_lift, 300, 180)
         """
+        self._lift_targets.pop(id(motor), None)  # 位置がわからなくなるので、次の move_lift() は必ず動かす
         if timeout is not None:
             # タイムアウト付きで実行
             await run_with_timeout(
-                start_fn=lambda: motor.run_angle(speed, angle, wait=False),
+                start_fn=lambda: motor.run_angle(speed, angle),
                 done_fn=lambda: motor.control.done(),
                 stop_fn=motor.stop,
                 timeout_ms=timeout,
@@ -273,6 +496,99 @@ class Robot:
             # 通常の実行（完了まで待つ）
             await motor.run_angle(speed, angle)
 
+    def start_motor(self, motor, speed, angle, then=Stop.HOLD):
+        """
+        個別のモーターを動かし始める（終わるのを待たない）
+
+        【パラメータ】
+        - motor: 対象のモーター（left_lift, right_liftなど）
+        - speed: 回転速度（deg/s）
+        - angle: 回転角度（度）
+        - then: 止まり方（Stop.HOLD など）
+
+        【使用例】
+        lift = robot.start_motor(right_lift, 1000, 180 * 40)  # アームを動かしながら
+        await robot.straight(300)                              # 走る
+        await lift                                             # アームが終わるまで待つ
+
+        返したハンドルは lift.done() で終わったかを調べられます。
+        走行用のモーター（left_wheel, right_wheel）には使わないでください（走行の命令で止まります）。
+        """
+        self._lift_targets.pop(id(motor), None)  # 位置がわからなくなるので、次の move_lift() は必ず動かす
+        motor.run_angle(speed, angle, then=then, wait=False)
+        return MotorMove(motor)
+
+    # ----- リフトを名前つきの位置に動かす -----
+    def add_lift(self, motor, positions):
+        """
+        リフトのモーターと、名前つきの位置（{"UP": -360, ...}）を登録する
+        move_lift() / start_lift() で位置の名前を使う mission の最初に呼ぶ：
+        robot.add_lift(right_lift, RIGHT_LIFT_POSITIONS)
+        """
+        self._lift_positions[id(motor)] = positions
+
+    def _lift_target(self, motor, position):
+        """位置の名前（"UP" など）か角度を、目標の角度にする"""
+        if isinstance(position, str):
+            return self._lift_positions[id(motor)][position]
+        return position
+
+    def _lift_at(self, motor, target):
+        """最後の目標が target で、実際の角度もそこにあれば True"""
+        if self._lift_targets.get(id(motor)) != target:
+            return False
+        return abs(motor.angle() - target) <= LIFT_TOLERANCE
+
+    async def move_lift(self, motor, position, speed=LIFT_SPEED, timeout=None):
+        """
+        リフトを決まった位置に動かす（run_target で角度を指定するので、ずれがたまらない）
+
+        【パラメータ】
+        - motor: リフトのモーター（left_lift, right_lift）
+        - position: 位置の名前（"UP", "DOWN", "CARRY"）か角度（度）
+        - speed: 回転速度（deg/s）。省略時は LIFT_SPEED
+        - timeout: タイムアウト時間（ミリ秒）。省略時はタイムアウトなし
+
+        【使用例】
+        await robot.move_lift(right_lift, "UP")
+        await robot.move_lift(left_lift, "CARRY", speed=800)
+
+        最後に動かした目標の位置にいて、実際の角度もそこにあるときは、何もせずにすぐ終わる。
+        （モーター角度をリセットしたあとは実際の角度で確かめるので、リセット前の目標が残っていても必要な動きは省かない）
+        着いたら True、タイムアウトで止めたら False を返す。
+        """
+        target = self._lift_target(motor, position)
+        if self._lift_at(motor, target):
+            return True
+        self._lift_targets[id(motor)] = target
+        if timeout is None:
+            await motor.run_target(speed, target)
+            return True
+        finished = await run_with_timeout(
+            start_fn=lambda: motor.run_target(speed, target),
+            done_fn=motor.done,
+            stop_fn=motor.stop,
+            timeout_ms=timeout,
+        )
+        if not finished:
+            self._lift_targets.pop(id(motor), None)  # 着いていないので、次は必ず動かす
+        return finished
+
+    def start_lift(self, motor, position, speed=LIFT_SPEED):
+        """
+        リフトを決まった位置に動かし始める（終わるのを待たない）。start_motor() と同じハンドルを返す
+
+        【使用例】
+        lift = robot.start_lift(right_lift, "UP")
+        await robot.straight(300)
+        await lift
+        """
+        target = self._lift_target(motor, position)
+        if not self._lift_at(motor, target):
+            self._lift_targets[id(motor)] = target
+            motor.run_target(speed, target, wait=False)
+        return MotorMove(motor)
+
     # ----- 元のDriveBaseのメソッドをそのまま使えるようにする -----
     def stop(self):
         """ロボットを停止"""
@@ -287,8 +603,35 @@ class Robot:
         return self._robot.distance()
 
     def settings(self, **kwargs):
-        """設定を変更（元のDriveBase.settingsと同じ）"""
-        self._robot.settings(**kwargs)
+        """
+        設定を変更（元のDriveBase.settingsと同じ）
+        値を覚えておき、次に動くときに変わった値だけを送る。引数なしなら今の設定を返す。
+        """
+        if not kwargs:
+            self._sync_settings()
+            return self._robot.settings()
+        self._wanted.update(kwargs)
+
+    def push_settings(self, **kwargs):
+        """設定を積む。pop_settings() までの動きは、スピード指定つきの動きのあともこの設定に戻る"""
+        top = dict(self._overrides[-1])
+        top.update(kwargs)
+        self._overrides.append(top)
+        self._wanted.update(kwargs)
+
+    def pop_settings(self):
+        """push_settings() で積んだ設定を 1 つ戻す"""
+        if len(self._overrides) > 1:
+            self._overrides.pop()
+        self._wanted.update(self._overrides[-1])
+
+    def reset_settings(self):
+        """積んだ設定を捨て、デフォルト設定を DriveBase に入れ直す"""
+        defaults = dict(DEFAULT_STRAIGHT_SETTINGS, **DEFAULT_TURN_SETTINGS)
+        self._robot.settings(**defaults)
+        self._applied = dict(defaults)
+        self._wanted = dict(defaults)
+        self._overrides = [dict(defaults)]
 
     def done(self):
         """現在の移動が完了したかどうか"""
@@ -493,3 +836,27 @@ def initialize_robot():
 
     # ----- すべての設定情報を返す -----
     return hub, robot, left_wheel, right_wheel, left_lift, right_lift
+
+
+# ===== 2回目以降のrunの準備をする関数 =====
+def reset_robot(hub, robot, left_wheel, right_wheel, left_lift, right_lift):
+    """
+    initialize_robot() で準備したロボットを、次のrunのために軽くリセットする関数
+
+    【説明】
+    メニューから続けてrunを実行するとき、ハブやモーターを作り直さずに、
+    前のrunが変えた速度の設定と、方向・走行距離・モーター角度だけを最初の状態に戻します。
+    作り直すより速く、メモリも使いません。
+    エラーが出たときは、メニューが initialize_robot() で最初からやり直します。
+
+    【実行する処理（順番通り）】
+    1. ロボットを止める
+    2. 速度・加速度をデフォルト設定に戻す
+    3. センサーの初期化（ジャイロ・方向・走行距離）
+    4. モーター角度のリセット
+    """
+    robot.stop()  # 前のrunの動きが残っていれば止める
+    robot.reset_settings()  # デフォルト設定に戻す（積んだ設定も捨てる）
+    initialize_sensors(hub, robot)  # ジャイロを使う設定・方向0度・走行距離0
+    reset_motor_angles(left_wheel, right_wheel, left_lift, right_lift)
+    print("=== ロボットリセット完了 ===")
@@ -10,12 +10,22 @@ run01〜run06 を 1 つの hub_main.py に結合し、pybricksdev で送信す
 """
 
 import argparse
+import asyncio
 import re
 import shutil
 import subprocess
+import time
 from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
 
 import build
+from hubd import DEFAULT_PORT, send_via_daemon
+from metrics import BUDGETS_FILE, BudgetExceeded, load_budgets
+from upload import UPLOAD_STATE_FILE, FakeHub, UploadState, report_delta
+from watch import watch_runs
+
+
+DEFAULT_HUB_NAME = "Pybricks Hub"
 
 
 def ensure_pybricksdev_available() -> None:
@@ -37,6 +47,209 @@ def supports_no_start() -> bool:
     return "--no-start" in help_text
 
 
+def pack_multi_mpy(modules: Sequence[Tuple[str, bytes]]) -> bytes:
+    """Pybricks のマルチファイル形式（サイズ 4 バイト + モジュール名 + NUL + mpy）にまとめる。"""
+    blob = bytearray()
+    for name, mpy in modules:
+        blob += len(mpy).to_bytes(4, "little")
+        blob += name.encode("utf-8") + b"\x00"
+        blob += mpy
+    return bytes(blob)
+
+
+async def send_program(hub, program: bytes, start: bool) -> None:
+    """接続済みでない hub（PybricksHubBLE / upload.FakeHub）に program を送り、start なら開始する。"""
+    await hub.connect()
+    try:
+        await hub.download_user_program(program)
+        if start:
+            await hub.start_user_program()
+    finally:
+        await hub.disconnect()
+
+
+async def send_precompiled(mpy_modules: Sequence[Tuple[str, Path]], hub_name: str, start: bool) -> None:
+    """
+    コンパイル済みの .mpy（モジュール名, パス）を pybricksdev の API でそのまま Hub に送る（PC 側での再コンパイルなし）。
+    先頭のモジュールが __main__ として起動する。
+    """
+    try:
+        from pybricksdev.ble import find_device
+        from pybricksdev.connections.pybricks import PybricksHubBLE
+    except ImportError:
+        raise SystemExit("pybricksdev が見つかりません。pipx/pip でインストールしてください。")
+
+    program = pack_multi_mpy([(name, path.read_bytes()) for name, path in mpy_modules])
+    names = ", ".join(path.name for _, path in mpy_modules)
+    print(f"Sending {names} ({len(program)} bytes) to {hub_name!r}")
+    device = await find_device(hub_name)
+    await send_program(PybricksHubBLE(device), program, start)
+
+
+def resolve_single(single: str, root: Path) -> Tuple[Path, Optional[str]]:
+    """--single の引数（runXX か、その中のファイル）から (run ディレクトリ, mission_override) を返す。"""
+    single_path = Path(single)
+    if not single_path.is_absolute():
+        single_path = root / single_path
+    if single_path.is_file():
+        candidate = single_path.parent
+        mission_override = single_path.stem if re.match(r"[mM]\d", single_path.stem) else None
+    else:
+        candidate = single_path
+        mission_override = None
+    run_dir = None
+    current = candidate
+    while True:
+        if current.name.startswith("run") and re.match(r"run\d+", current.name):
+            run_dir = current
+            break
+        if current == current.parent:
+            break
+        current = current.parent
+    if run_dir is None or not run_dir.is_dir():
+        raise FileNotFoundError(
+            f"Run directory not found from: {single_path}. "
+            "Open a file inside runXX or pass runXX."
+        )
+    return run_dir, mission_override
+
+
+def mpy_modules_for(paths: Sequence[Path], mpy_paths: Sequence[Optional[Path]]) -> Optional[List[Tuple[str, Path]]]:
+    """ビルドしたモジュールと .mpy から送信用の（モジュール名, .mpy）を作る。1 つでも .mpy がなければ None。"""
+    if not mpy_paths or any(path is None for path in mpy_paths):
+        return None
+    return [("__main__" if index == 0 else path.stem, mpy) for index, (path, mpy) in enumerate(zip(paths, mpy_paths))]
+
+
+def program_modules(paths: Sequence[Path], mpy_modules: Optional[List[Tuple[str, Path]]]) -> List[Tuple[str, bytes]]:
+    """送る program を構成する（モジュール名, 中身）。.mpy があればその中身、なければソース。"""
+    if mpy_modules is not None:
+        return [(name, path.read_bytes()) for name, path in mpy_modules]
+    return [("__main__" if index == 0 else path.stem, path.read_bytes()) for index, path in enumerate(paths)]
+
+
+async def send_artifact(
+    root: Path,
+    paths: Sequence[Path],
+    mpy_modules: Optional[List[Tuple[str, Path]]],
+    hub_name: str,
+    start: bool,
+    state: Optional[UploadState] = None,
+    fake_hub: Optional[Path] = None,
+    daemon_port: Optional[int] = None,
+    fake_rate: Optional[float] = None,
+) -> bool:
+    """
+    .mpy があれば API で直接、なければ pybricksdev run ble でソースを送る。送ったら True、省いたら False。
+    paths の先頭が入口（hub_main.py）。--layout modules では pybricksdev が
+    import している同じディレクトリの runXX.py / robotlib_<hash>.py を一緒に送る。
+    state（--delta）を渡すと、前回この Hub に送ったときから何も変わっていなければ送らない。
+    fake_hub（ディレクトリ）を渡すと、BLE の代わりに upload.FakeHub に送る（fake_rate バイト/秒の転送時間を模擬）。
+    daemon_port を渡すと、起動中の hubd.py に渡して接続済みのまま送る（起動していない、または .mpy がなければ直接送る）。
+    """
+    modules = program_modules(paths, mpy_modules)
+    if state is not None and not report_delta(hub_name, modules, state.changed(hub_name, modules)):
+        if start:
+            print("Note: --start-now was ignored because nothing was sent. Start the program on the hub.")
+        return False
+    sent = False
+    if daemon_port is not None:
+        if mpy_modules is None:
+            # Hub はソースを実行できないので、コンパイル済みでなければ hubd には渡さない
+            print("hubd needs a compiled program but no .mpy was built; sending directly")
+        else:
+            sent = await asyncio.to_thread(send_to_daemon, modules, hub_name, start, daemon_port)
+    if not sent:
+        if fake_hub is not None:
+            # .mpy がなければソースを同じ形式に詰める（FakeHub は中身を解釈しない）
+            await send_program(FakeHub(fake_hub, hub_name, bytes_per_s=fake_rate), pack_multi_mpy(modules), start)
+        elif mpy_modules is not None:
+            await send_precompiled(mpy_modules, hub_name, start=start)
+        else:
+            await send_with_pybricksdev(root, paths[0], hub_name, start)
+    if state is not None:
+        state.record(hub_name, modules)
+    return True
+
+
+def send_to_daemon(modules: Sequence[Tuple[str, bytes]], hub_name: str, start: bool, port: int) -> bool:
+    """
+    hubd.py にコンパイル済みの program（.mpy のモジュール）を渡す。
+    送れたら True、hubd が起動していなければ（接続を断られたら）False（呼び出し側が直接送る）。
+    hubd が Hub への送信に失敗した場合や、渡した後に応答がない場合は ConnectionError。
+    hubd が Hub に送り終えているかもしれないので、そのときは直接送り直さない。
+    """
+    program = pack_multi_mpy(modules)
+    try:
+        result = send_via_daemon(program, hub_name, start, "mpy", port)
+    except ConnectionRefusedError as exc:
+        print(f"hubd is not reachable on port {port} ({exc}); sending directly")
+        return False
+    if not result.get("ok"):
+        raise ConnectionError(f"hubd: {result.get('error')}")
+    connection = "reused connection" if result.get("reused") else "new connection"
+    print(f"Sent {len(program)} bytes to {hub_name!r} via hubd in {result.get('ms')} ms ({connection})")
+    return True
+
+
+async def send_with_pybricksdev(root: Path, output_path: Path, hub_name: str, start: bool) -> None:
+    """
+    pybricksdev run ble でソースを送る（PC 側でコンパイルされる）。
+    複数の Hub に並行して送るときに混ざらないよう、出力の各行に [Hub 名] を付ける。
+    """
+    ensure_pybricksdev_available()
+    cmd = ["pybricksdev", "run", "ble"]
+    if not start:
+        if await asyncio.to_thread(supports_no_start):
+            cmd.append("--no-start")
+        else:
+            print("Warning: pybricksdev が --no-start をサポートしていません。即時開始になります。")
+    cmd.extend([str(output_path), "--name", hub_name])
+    print(f"[{hub_name}] Running:", " ".join(cmd))
+    process = await asyncio.create_subprocess_exec(
+        *cmd, cwd=str(root), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+    async for line in process.stdout:
+        print(f"[{hub_name}] {line.decode('utf-8', errors='replace').rstrip()}")
+    returncode = await process.wait()
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+DeployResult = Tuple[str, str, float]
+
+
+async def deploy(hub_names: Sequence[str], send_one: Callable[[str], Awaitable[bool]]) -> List[DeployResult]:
+    """
+    hub_names の全 Hub に send_one(Hub 名) で並行して送る。
+    1 台が失敗しても他の送信は止めない。Hub ごとに結果の行を表示し、(Hub 名, 結果, ms) の一覧を返す。
+    """
+
+    async def deploy_one(hub_name: str) -> DeployResult:
+        timer = time.perf_counter()
+        try:
+            status = "sent" if await send_one(hub_name) else "skipped"
+        except (Exception, SystemExit) as exc:
+            status = f"FAILED ({type(exc).__name__}: {exc})"
+        elapsed_ms = (time.perf_counter() - timer) * 1000
+        print(f"[{hub_name}] {status} in {elapsed_ms:.0f} ms")
+        return hub_name, status, elapsed_ms
+
+    return list(await asyncio.gather(*(deploy_one(hub_name) for hub_name in hub_names)))
+
+
+def print_deploy_summary(results: Sequence[DeployResult], elapsed_ms: float) -> None:
+    """複数 Hub への送信結果と、Hub ごと・全体の時間を表示する。"""
+    width = max(len(hub_name) for hub_name, _, _ in results)
+    print(f"Deploy summary ({len(results)} hubs, {elapsed_ms:.0f} ms total):")
+    for hub_name, status, hub_ms in results:
+        print(f"  {hub_name:<{width}}  {hub_ms:>7.0f} ms  {status}")
+
+
+def failed_hubs(results: Sequence[DeployResult]) -> List[str]:
+    return [hub_name for hub_name, status, _ in results if status.startswith("FAILED")]
+
+
 def main():
     parser = argparse.ArgumentParser(description="PC-only: build hub_main.py and send via pybricksdev")
     parser.add_argument(
@@ -53,8 +266,8 @@ def main():
     )
     parser.add_argument(
         "--hub",
-        default="Pybricks Hub",
-        help='target hub name for pybricksdev (default: "Pybricks Hub")',
+        action="append",
+        help='target hub name for pybricksdev (default: "Pybricks Hub"); repeat to upload to several hubs at once',
     )
     parser.add_argument(
         "--start-now",
@@ -70,58 +283,237 @@ def main():
         action="store_true",
         help="generate hub_main.py without sending to Hub",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"regenerate every run block without using {build.BUILD_CACHE_DIR}/",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report build cache hits/misses and build wall time",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="send a minified build (no docstrings/comments, shorter local names)",
+    )
+    parser.add_argument(
+        "--dev",
+        action="store_true",
+        help="send a development build that prints stop timing on the hub (menu builds only)",
+    )
+    parser.add_argument(
+        "--mpy",
+        action="store_true",
+        help="compile to .mpy with mpy-cross (cached) and send the precompiled artifact",
+    )
+    parser.add_argument(
+        "--keep-variants",
+        action="store_true",
+        help="include every m*.py variant instead of only the active one",
+    )
+    parser.add_argument(
+        "--keep-dead-code",
+        action="store_true",
+        help="keep functions/methods that no run can reach",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running: rebuild on every runXX/*.py save and send again (unless --build-only)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="processes for generating run blocks (default: automatic)",
+    )
+    parser.add_argument(
+        "--budgets",
+        default=BUDGETS_FILE,
+        help=f"size budget file; the build fails when a run exceeds it (default: {BUDGETS_FILE}, skipped if missing)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=("single", "modules"),
+        default="single",
+        help=f"single: one hub_main.py (default); modules: one module per run in {build.MODULES_DIR}/, imported on selection",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help=f"skip the upload when no module changed since the last send to this hub (state in {UPLOAD_STATE_FILE})",
+    )
+    parser.add_argument(
+        "--force-upload",
+        action="store_true",
+        help="with --delta: send even if nothing changed (e.g. after another program was loaded on the hub)",
+    )
+    parser.add_argument(
+        "--fake-hub",
+        metavar="DIR",
+        help="send to a local stand-in that stores the program in DIR instead of a hub over BLE",
+    )
+    parser.add_argument(
+        "--fake-hub-rate",
+        type=float,
+        default=None,
+        metavar="BYTES_PER_S",
+        help="with --fake-hub: simulate a transfer at this rate (e.g. 5000 for BLE)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="hand the program to a running hubd.py, which keeps the hub connected between sends (implies --mpy)",
+    )
+    parser.add_argument(
+        "--daemon-port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"local port of hubd.py (default: {DEFAULT_PORT})",
+    )
     args = parser.parse_args()
 
     root = Path(__file__).resolve().parent
     output_path = root / args.output
+    if args.layout == "modules":
+        if args.single:
+            raise SystemExit("--layout modules はメニュー付きの全 run ビルド用です。--single とは併用できません。")
+        output_path = root / build.MODULES_DIR / f"{build.MENU_MODULE}.py"
     if args.run_id is not None:
         print("Warning: --run-id is deprecated and ignored. Select RUN on Hub menu.")
 
     if args.single:
-        single_path = Path(args.single)
-        if not single_path.is_absolute():
-            single_path = root / single_path
-        if single_path.is_file():
-            candidate = single_path.parent
-            mission_override = single_path.stem if re.match(r"[mM]\d", single_path.stem) else None
-        else:
-            candidate = single_path
-            mission_override = None
-        run_dir = None
-        current = candidate
-        while True:
-            if current.name.startswith("run") and re.match(r"run\d+", current.name):
-                run_dir = current
-                break
-            if current == current.parent:
-                break
-            current = current.parent
-        if run_dir is None or not run_dir.is_dir():
-            raise FileNotFoundError(
-                f"Run directory not found from: {single_path}. "
-                "Open a file inside runXX or pass runXX."
-            )
-        build.build(run_dir, output_path, mission_override=mission_override)
+        run_dir, mission_override = resolve_single(args.single, root)
+        run_dirs = [run_dir]
     else:
         run_dirs = [p for p in root.glob("run*") if p.is_dir() and re.match(r"run\d+", p.name)]
         if not run_dirs:
             raise FileNotFoundError("No run directories found (expected run01, run02, ...).")
-        build.build_multi(run_dirs, output_path)
+    cache = build.BuildCache(None if args.no_cache else root / build.BUILD_CACHE_DIR)
+    budgets = load_budgets(root / args.budgets)
+    hub_names = list(dict.fromkeys(args.hub or [DEFAULT_HUB_NAME]))
+    state = UploadState(root / UPLOAD_STATE_FILE) if args.delta else None
+    if state is not None and args.force_upload:
+        for hub_name in hub_names:
+            state.forget(hub_name)
+    fake_hub = Path(args.fake_hub).resolve() if args.fake_hub else None
+    daemon_port = args.daemon_port if args.daemon else None
+    # hubd はコンパイル済みの program しか Hub に送らないので、--daemon なら .mpy も作る
+    compile_mpy = args.mpy or args.daemon
+
+    def build_artifact() -> Tuple[List[Path], Optional[List[Tuple[str, Path]]]]:
+        """
+        hub_main.py（と --mpy なら .mpy）を作り、(書き出したファイル（先頭が入口）,
+        送る（モジュール名, .mpy）の一覧（なければ None）) を返す。
+        """
+        timer = time.perf_counter()
+        paths = [output_path]
+        if args.layout == "modules":
+            paths = build.build_modules(
+                run_dirs,
+                output_path.parent,
+                cache=cache,
+                minify=args.minify,
+                keep_variants=args.keep_variants,
+                keep_dead_code=args.keep_dead_code,
+                jobs=args.jobs,
+                budgets=budgets,
+                dev=args.dev,
+            )
+            if args.stats or args.watch:
+                cache.report((time.perf_counter() - timer) * 1000)
+        elif args.single:
+            build.build(
+                run_dir,
+                output_path,
+                mission_override=mission_override,
+                minify=args.minify,
+                keep_variants=args.keep_variants,
+                keep_dead_code=args.keep_dead_code,
+                budgets=budgets,
+            )
+        else:
+            build.build_multi(
+                run_dirs,
+                output_path,
+                cache=cache,
+                minify=args.minify,
+                keep_variants=args.keep_variants,
+                keep_dead_code=args.keep_dead_code,
+                jobs=args.jobs,
+                budgets=budgets,
+                dev=args.dev,
+            )
+            if args.stats or args.watch:
+                cache.report((time.perf_counter() - timer) * 1000)
+
+        if not compile_mpy:
+            return paths, None
+        mpy_modules = mpy_modules_for(paths, [build.build_mpy(path, cache_dir=cache.cache_dir) for path in paths])
+        if mpy_modules is None:
+            print("Warning: .mpy を作れなかったため、ソースのまま送信します。")
+        return paths, mpy_modules
+
+    def send_all(paths: List[Path], mpy_modules: Optional[List[Tuple[str, Path]]]) -> List[str]:
+        """ビルド済みの program を全 Hub に並行して送り、失敗した Hub 名を返す（2 台以上なら集計も表示）。"""
+        timer = time.perf_counter()
+        results = asyncio.run(
+            deploy(
+                hub_names,
+                lambda hub_name: send_artifact(
+                    root,
+                    paths,
+                    mpy_modules,
+                    hub_name,
+                    args.start_now,
+                    state=state,
+                    fake_hub=fake_hub,
+                    daemon_port=daemon_port,
+                    fake_rate=args.fake_hub_rate,
+                ),
+            )
+        )
+        if len(hub_names) > 1:
+            print_deploy_summary(results, (time.perf_counter() - timer) * 1000)
+        return failed_hubs(results)
 
-    if args.build_only:
-        print("Build completed. Skip sending because --build-only is set.")
+    if not args.watch:
+        try:
+            paths, mpy_modules = build_artifact()
+        except BudgetExceeded as exc:
+            raise SystemExit(f"Build failed: over budget ({exc})")
+        if args.build_only:
+            print("Build completed. Skip sending because --build-only is set.")
+            return
+        failed = send_all(paths, mpy_modules)
+        if failed:
+            raise SystemExit(f"Upload failed: {', '.join(failed)}")
         return
 
-    ensure_pybricksdev_available()
-    cmd = ["pybricksdev", "run", "ble"]
-    if not args.start_now:
-        if supports_no_start():
-            cmd.append("--no-start")
-        else:
-            print("Warning: pybricksdev が --no-start をサポートしていません。即時開始になります。")
-    cmd.extend([str(output_path), "--name", args.hub])
-    print("Running:", " ".join(cmd))
-    subprocess.run(cmd, check=True, cwd=str(root))
+    if not args.build_only and not compile_mpy and fake_hub is None:
+        ensure_pybricksdev_available()
+
+    def on_change(changed) -> None:
+        if changed:
+            print(f"Changed: {', '.join(sorted(build.source_name(path) for path in changed))}")
+        cache.reset_stats()
+        timer = time.perf_counter()
+        try:
+            paths, mpy_modules = build_artifact()
+        except Exception as exc:
+            # 書きかけのファイルでも監視は止めない（前回の hub_main.py はそのまま）
+            print(f"Build failed: {type(exc).__name__}: {exc}")
+            return
+        # 送信に失敗した Hub があっても監視は続ける（結果は Hub ごとに表示済み）
+        if not args.build_only and send_all(paths, mpy_modules):
+            return
+        print(f"Ready in {(time.perf_counter() - timer) * 1000:.0f} ms")
+
+    on_change(set())
+    watch_runs(run_dirs, on_change)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,242 @@
+"""
+PC側で使うソースマップのツール。Hub には送らない。
+build.py が hub_main.py と一緒に書き出す hub_main.map.json を使い、
+Hub のトレースバックやログに出る hub_main.py の行番号を、元の runXX/mYY.py・main.py・setup.py の行に戻す。
+
+使い方:
+    python sourcemap.py logs/run03-20260101-101500.log
+    pybricksdev run ble hub_main.py --name "Pybricks Hub" 2>&1 | python sourcemap.py
+    python sourcemap.py --map hub_modules logs/...   # build.py --layout modules の出力（モジュールごとのマップ）
+"""
+
+import argparse
+import ast
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+SOURCE_MAP_SUFFIX = ".map.json"
+SOURCE_MAP_VERSION = 1
+
+Origin = Optional[Tuple[str, int]]
+
+
+def source_map_path(generated: Path) -> Path:
+    """hub_main.py に対応するソースマップのパス（hub_main.map.json）。"""
+    return generated.with_suffix(SOURCE_MAP_SUFFIX)
+
+
+def node_line_map(before: ast.AST, after_code: str) -> Dict[int, int]:
+    """
+    書き換え前の AST（元の行番号を保持）と、それを出力したコードを並べて辿り、
+    出力側の行番号 -> 書き換え前の行番号 の対応を返す。構造が食い違ったところで打ち切る。
+    """
+    line_map: Dict[int, int] = {}
+    for old, new in zip(ast.walk(before), ast.walk(ast.parse(after_code))):
+        if type(old) is not type(new):
+            break
+        old_line = getattr(old, "lineno", None)
+        new_line = getattr(new, "lineno", None)
+        if old_line is not None and new_line is not None:
+            line_map.setdefault(new_line, old_line)
+    return line_map
+
+
+class MappedText:
+    """生成コードの各行と、その行がどのファイルの何行目から来たかを一緒に持つ。"""
+
+    def __init__(self, lines: Sequence[str] = (), origins: Sequence[Origin] = ()):
+        self.lines: List[str] = list(lines)
+        self.origins: List[Origin] = list(origins) or [None] * len(self.lines)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def add(self, text, source: Optional[str] = None, line_map: Optional[Dict[int, int]] = None) -> None:
+        """
+        text（str または MappedText）を末尾に足す。
+        source と line_map を渡すと、対応の取れない行は直前の対応行で埋める。
+        """
+        if isinstance(text, MappedText):
+            self.lines.extend(text.lines)
+            self.origins.extend(text.origins)
+            return
+        last: Optional[int] = None
+        for number, line in enumerate(text.split("\n"), start=1):
+            if line_map is not None and number in line_map:
+                last = line_map[number]
+            self.lines.append(line)
+            self.origins.append((source, last) if source is not None and last is not None else None)
+
+    def insert_line(self, index: int, line: str) -> None:
+        self.lines.insert(index, line)
+        self.origins.insert(index, None)
+
+    def to_json(self) -> dict:
+        return {"lines": self.lines, "origins": [list(origin) if origin else None for origin in self.origins]}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "MappedText":
+        return cls(data["lines"], [tuple(origin) if origin else None for origin in data["origins"]])
+
+
+def follow_rewrite(origins: Sequence[Origin], line_map: Dict[int, int], line_count: int) -> List[Origin]:
+    """node_line_map の結果（新しい行 -> 古い行）で、古い行の対応を新しい行に移す。"""
+    result: List[Origin] = []
+    last: Origin = None
+    for number in range(1, line_count + 1):
+        old = line_map.get(number)
+        if old is not None and 0 < old <= len(origins):
+            last = origins[old - 1]
+        result.append(last)
+    return result
+
+
+def follow_line_numbers(origins: Sequence[Origin], numbers: Sequence[int]) -> List[Origin]:
+    """行の削除・置き換えだけの書き換えについて、新しい各行の元の行番号 numbers から対応を引き継ぐ。"""
+    return [origins[number - 1] if 0 < number <= len(origins) else None for number in numbers]
+
+
+def write_source_map(generated: Path, origins: Sequence[Origin]) -> Path:
+    """
+    生成コードの行ごとの対応を、連続する範囲にまとめて JSON で書き出す。
+    ranges の各要素は [生成側の開始行, 終了行, sources の番号, 元の開始行]（範囲内は 1 行ずつ進む）。
+    """
+    sources: List[str] = []
+    ranges: List[List[int]] = []
+    for number, origin in enumerate(origins, start=1):
+        if origin is None:
+            continue
+        source, line = origin
+        if source not in sources:
+            sources.append(source)
+        index = sources.index(source)
+        if ranges:
+            start, end, last_index, first_line = ranges[-1]
+            if end == number - 1 and last_index == index and first_line + (number - start) == line:
+                ranges[-1][1] = number
+                continue
+        ranges.append([number, number, index, line])
+    path = source_map_path(generated)
+    data = {"version": SOURCE_MAP_VERSION, "generated": generated.name, "sources": sources, "ranges": ranges}
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+class SourceMap:
+    """書き出したソースマップを読み、生成側の行番号から元の (ファイル, 行) を引く。"""
+
+    def __init__(self, data: dict):
+        if data.get("version") != SOURCE_MAP_VERSION:
+            raise ValueError(f"unsupported source map version: {data.get('version')}")
+        self.generated: str = data["generated"]
+        self.sources: List[str] = data["sources"]
+        self.ranges: List[List[int]] = data["ranges"]
+
+    @classmethod
+    def load(cls, path: Path) -> "SourceMap":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def lookup(self, line: int) -> Origin:
+        low, high = 0, len(self.ranges)
+        while low < high:
+            middle = (low + high) // 2
+            if self.ranges[middle][1] < line:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self.ranges):
+            return None
+        start, end, index, first_line = self.ranges[low]
+        if not start <= line <= end:
+            return None
+        return self.sources[index], first_line + (line - start)
+
+
+TRACEBACK_LINE = re.compile(r'File "(?P<file>[^"]+)", line (?P<line>\d+)')
+
+
+def rewrite_log(
+    lines: Iterable[str], source_maps: Union[SourceMap, Sequence[SourceMap]], root: Optional[Path] = None
+) -> Iterable[str]:
+    """
+    トレースバックの `File "hub_main.py", line N` を元のファイル・行に書き換える。
+    source_maps に複数のマップ（--layout modules のモジュールごと）を渡すと、ファイル名で使い分ける。
+    先頭のマップは __main__ としても引く。root を渡すと、元ファイルの該当行も次の行に添える。
+    """
+    if isinstance(source_maps, SourceMap):
+        source_maps = [source_maps]
+    by_name: Dict[str, SourceMap] = {}
+    for source_map in reversed(source_maps):
+        for name in (source_map.generated, Path(source_map.generated).stem):
+            by_name[name] = source_map
+    if source_maps:
+        for name in ("__main__", "__main__.py"):
+            by_name[name] = source_maps[0]
+    for line in lines:
+        match = TRACEBACK_LINE.search(line)
+        origin = None
+        source_map = by_name.get(Path(match.group("file")).name) if match else None
+        if source_map is not None:
+            origin = source_map.lookup(int(match.group("line")))
+        if origin is None:
+            yield line
+            continue
+        source, source_line = origin
+        code = source_line_text(root / source, source_line) if root is not None else None
+        ending = "\n" if line.endswith("\n") or code else ""
+        body = line[: match.start()] + f'File "{source}", line {source_line}' + line[match.end() :].rstrip("\n")
+        yield f"{body}  [{match.group('file')}:{match.group('line')}]{ending}"
+        if code:
+            indent = line[: len(line) - len(line.lstrip())]
+            yield f"{indent}    {code}\n"
+
+
+def source_line_text(path: Path, line: int) -> Optional[str]:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return None
+    if 0 < line <= len(lines):
+        return lines[line - 1].strip()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Map hub_main.py tracebacks back to runXX source files")
+    parser.add_argument("logs", nargs="*", help="captured hub output / log files (default: stdin)")
+    parser.add_argument(
+        "--map",
+        default=f"hub_main{SOURCE_MAP_SUFFIX}",
+        help=f"source map written by build.py, or a directory of them (default: hub_main{SOURCE_MAP_SUFFIX})",
+    )
+    args = parser.parse_args()
+
+    root = Path(__file__).resolve().parent
+    map_path = Path(args.map)
+    if not map_path.is_absolute():
+        map_path = root / map_path
+    if not map_path.exists():
+        raise SystemExit(f"{map_path} がありません。先に python build.py を実行してください。")
+    if map_path.is_dir():
+        # メニュー（hub_main）を先頭にして __main__ として引けるようにする
+        paths = sorted(map_path.glob(f"*{SOURCE_MAP_SUFFIX}"), key=lambda p: (p.name != f"hub_main{SOURCE_MAP_SUFFIX}", p.name))
+        source_map = [SourceMap.load(path) for path in paths]
+    else:
+        source_map = SourceMap.load(map_path)
+
+    if not args.logs:
+        for line in rewrite_log(sys.stdin, source_map, root):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        return
+    for log in args.logs:
+        with open(log, encoding="utf-8", errors="replace") as handle:
+            sys.stdout.writelines(rewrite_log(handle, source_map, root))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""PC側のテスト。リポジトリ直下のモジュール（build.py, selector.py など）を import できるようにする。"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
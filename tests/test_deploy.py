@@ -0,0 +1,39 @@
+"""selector.deploy() のテスト。1 台の Hub が失敗しても、他の Hub への送信が最後まで終わることを確かめる。"""
+
+import asyncio
+
+import selector
+from upload import FakeHub
+
+PROGRAM = b"program"
+
+
+class BrokenHub(FakeHub):
+    """送信の途中で切れる Hub。"""
+
+    async def download_user_program(self, program):
+        raise OSError("hub went out of range")
+
+
+def test_failure_stays_with_its_hub(tmp_path):
+    # 正常な Hub は転送に時間がかかるので、もう 1 台の失敗はその送信の途中で起きる
+    hubs = {
+        "good": FakeHub(tmp_path, "good", bytes_per_s=len(PROGRAM) * 20),
+        "bad": BrokenHub(tmp_path, "bad"),
+    }
+
+    async def send_one(hub_name):
+        await selector.send_program(hubs[hub_name], PROGRAM, start=True)
+        return True
+
+    results = asyncio.run(selector.deploy(["good", "bad"], send_one))
+
+    statuses = {hub_name: status for hub_name, status, _ in results}
+    assert statuses["good"] == "sent"
+    assert statuses["bad"].startswith("FAILED (OSError")
+    assert selector.failed_hubs(results) == ["bad"]
+    assert hubs["good"].downloads == 1
+    assert hubs["good"].started == 1
+    assert hubs["good"].program_path.read_bytes() == PROGRAM
+    assert not hubs["good"].connected
+    assert not hubs["bad"].program_path.exists()
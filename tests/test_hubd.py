@@ -0,0 +1,149 @@
+"""
+hubd.py のテスト。Hub の代わりに upload.FakeHub につなぐ connector で、空いているポートに serve() を立てて確かめる。
+"""
+
+import asyncio
+import contextlib
+import functools
+import socket
+import threading
+
+import pytest
+
+import hubd
+import selector
+from upload import FakeHub
+
+HUB = "test-hub"
+
+
+class SilentDaemon:
+    """接続を受けて program を読み切るが、結果を返さない hubd の代わり（Hub に送っている途中で固まった状態）。"""
+
+    def __init__(self):
+        self.listener = socket.create_server((hubd.HOST, 0))
+        self.port = self.listener.getsockname()[1]
+        self.received = b""
+        self.release = threading.Event()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        conn, _ = self.listener.accept()
+        with conn:
+            while True:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    break
+                self.received += chunk
+            self.release.wait(10)
+
+    def close(self):
+        self.release.set()
+        self.thread.join(10)
+        self.listener.close()
+
+
+class CountingConnector:
+    """FakeHub を作ってつなぎ、つないだ回数と作った Hub を覚える connector。"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hubs = []
+
+    async def __call__(self, hub_name):
+        hub = FakeHub(self.directory, hub_name)
+        await hub.connect()
+        self.hubs.append(hub)
+        return hub
+
+
+async def with_daemon(sessions, body, accept_source=True):
+    """serve() を port=0 で起動し、実際のポート番号で body(port) を実行してから止める。"""
+    ready = asyncio.get_running_loop().create_future()
+    server = asyncio.create_task(hubd.serve(sessions, port=0, accept_source=accept_source, ready=ready))
+    port = await ready
+    try:
+        return await body(port)
+    finally:
+        server.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await server
+
+
+def send(port, program, program_format="source"):
+    return asyncio.to_thread(hubd.send_via_daemon, program, HUB, False, program_format, port, 10.0)
+
+
+def test_second_send_reuses_session(tmp_path):
+    connector = CountingConnector(tmp_path)
+    sessions = hubd.HubSessions(connector)
+
+    async def body(port):
+        return await send(port, b"first"), await send(port, b"second")
+
+    first, second = asyncio.run(with_daemon(sessions, body))
+
+    assert first["ok"] and not first["reused"]
+    assert second["ok"] and second["reused"]
+    assert len(connector.hubs) == 1
+    assert connector.hubs[0].downloads == 2
+    assert connector.hubs[0].program_path.read_bytes() == b"second"
+
+
+def test_broken_session_is_dropped_and_reconnected(tmp_path):
+    connector = CountingConnector(tmp_path)
+    sessions = hubd.HubSessions(connector)
+
+    async def body(port):
+        first = await send(port, b"first")
+        # Hub の電源を切ったのと同じ: 開いたままの接続に送ると失敗する
+        connector.hubs[0].connected = False
+        second = await send(port, b"second")
+        return first, second, sessions.hubs.get(HUB)
+
+    first, second, current = asyncio.run(with_daemon(sessions, body))
+
+    assert first["ok"]
+    assert second["ok"] and not second["reused"]
+    assert len(connector.hubs) == 2
+    assert current is connector.hubs[1]
+    assert connector.hubs[0].downloads == 1
+    assert connector.hubs[1].downloads == 1
+    assert connector.hubs[1].program_path.read_bytes() == b"second"
+
+
+def test_source_is_rejected_for_real_hubs(tmp_path):
+    connector = CountingConnector(tmp_path)
+    sessions = hubd.HubSessions(connector)
+
+    async def body(port):
+        return await send(port, b"print('hi')", program_format="source")
+
+    result = asyncio.run(with_daemon(sessions, body, accept_source=False))
+
+    assert not result["ok"]
+    assert "--mpy" in result["error"]
+    assert connector.hubs == []
+
+
+def test_daemon_that_accepts_and_times_out_is_a_failure(monkeypatch):
+    daemon = SilentDaemon()
+    monkeypatch.setattr(selector, "send_via_daemon", functools.partial(hubd.send_via_daemon, timeout=0.5))
+    try:
+        # 受け取った後の失敗は「hubd がいない」ではないので、False（直接送り直し）にしない
+        with pytest.raises(ConnectionError) as excinfo:
+            selector.send_to_daemon([("__main__", b"mpy")], HUB, True, daemon.port)
+    finally:
+        daemon.close()
+
+    assert not isinstance(excinfo.value, ConnectionRefusedError)
+    assert "may already be on the hub" in str(excinfo.value)
+    assert daemon.received.endswith(b"mpy")
+
+
+def test_refused_connection_falls_back_to_direct_send():
+    with socket.create_server((hubd.HOST, 0)) as unused:
+        port = unused.getsockname()[1]
+
+    assert selector.send_to_daemon([("__main__", b"mpy")], HUB, True, port) is False
@@ -0,0 +1,101 @@
+"""
+upload.UploadState と selector --delta（report_delta）のテスト。FakeHub に送り、
+送信を省くとき・送るとき・--force-upload のときに、送ったかと .upload_state.json を書き直したかを確かめる。
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import selector
+from upload import UploadState, module_digest
+
+HUB = "test-hub"
+
+
+@pytest.fixture
+def setup(tmp_path):
+    """(入口のソース, UploadState, FakeHub のディレクトリ, save() の回数)。"""
+    main = tmp_path / "hub_main.py"
+    main.write_text("print('v1')\n", encoding="utf-8")
+    state = UploadState(tmp_path / ".upload_state.json")
+    saves = []
+    original_save = state.save
+
+    def counting_save():
+        saves.append(1)
+        original_save()
+
+    state.save = counting_save
+    return main, state, tmp_path / "fake", saves
+
+
+def send(main, state, fake_dir):
+    return asyncio.run(selector.send_artifact(main.parent, [main], None, HUB, False, state=state, fake_hub=fake_dir))
+
+
+def received(fake_dir):
+    return (fake_dir / f"{HUB}.bin").read_bytes()
+
+
+def recorded(state):
+    return json.loads(state.path.read_text(encoding="utf-8"))[HUB]
+
+
+def test_first_send_records_state(setup):
+    main, state, fake_dir, saves = setup
+
+    assert send(main, state, fake_dir)
+    assert b"print('v1')" in received(fake_dir)
+    assert recorded(state) == {"__main__": module_digest(main.read_bytes())}
+    assert len(saves) == 1
+
+
+def test_unchanged_program_is_skipped(setup, capsys):
+    main, state, fake_dir, saves = setup
+    send(main, state, fake_dir)
+    (fake_dir / f"{HUB}.bin").unlink()
+
+    assert not send(main, state, fake_dir)
+    assert not (fake_dir / f"{HUB}.bin").exists()
+    assert len(saves) == 1  # 送らなかったので書き直さない
+    assert "Upload skipped" in capsys.readouterr().out
+
+
+def test_changed_program_is_sent_and_recorded(setup, capsys):
+    main, state, fake_dir, saves = setup
+    send(main, state, fake_dir)
+    main.write_text("print('v2')\n", encoding="utf-8")
+
+    assert send(main, state, fake_dir)
+    assert b"print('v2')" in received(fake_dir)
+    assert recorded(state) == {"__main__": module_digest(main.read_bytes())}
+    assert len(saves) == 2
+    assert "Changed modules for 'test-hub': __main__" in capsys.readouterr().out
+
+
+def test_force_upload_sends_unchanged_program(setup):
+    main, state, fake_dir, saves = setup
+    send(main, state, fake_dir)
+    (fake_dir / f"{HUB}.bin").unlink()
+
+    # selector.py --force-upload と同じ
+    state.forget(HUB)
+    assert HUB not in json.loads(state.path.read_text(encoding="utf-8"))
+
+    assert send(main, state, fake_dir)
+    assert b"print('v1')" in received(fake_dir)
+    assert recorded(state) == {"__main__": module_digest(main.read_bytes())}
+    assert len(saves) == 3  # 最初の送信、forget、送り直し
+
+
+def test_state_is_kept_per_hub(tmp_path):
+    state = UploadState(tmp_path / ".upload_state.json")
+    modules = [("__main__", b"a"), ("run01", b"b")]
+    state.record("hub-a", modules)
+
+    reloaded = UploadState(state.path)
+    assert reloaded.changed("hub-a", modules) == []
+    assert reloaded.changed("hub-b", modules) == ["__main__", "run01"]
+    assert reloaded.changed("hub-a", [("__main__", b"a"), ("run02", b"c")]) == ["run01", "run02"]
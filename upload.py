@@ -0,0 +1,118 @@
+"""
+PC側の送信まわり。selector.py から呼ばれる。Hub には送らない。
+
+- UploadState: Hub 名ごとに、最後に送ったモジュールのハッシュを .upload_state.json に覚える（selector.py --delta）
+- FakeHub: 実機の代わりに、受け取った program をディレクトリに保存する（selector.py --fake-hub、実機なしでの確認用）
+
+Pybricks のファームウェアは program 全体を 1 つとして受け取り、前の program を置き換える。
+そのためモジュール単位で一部だけ送ることはできない。--delta では、前回送ったときから変わったモジュールがなければ
+送信そのものを省き、変わっていれば変わったモジュールを表示して全体を送る。
+"""
+
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+UPLOAD_STATE_FILE = ".upload_state.json"
+
+Modules = Sequence[Tuple[str, bytes]]
+
+
+def module_digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+class UploadState:
+    """Hub 名 -> {モジュール名: ハッシュ}。送信が成功したときだけ record() で更新する。"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.hubs: Dict[str, Dict[str, str]] = {}
+        if path.exists():
+            try:
+                self.hubs = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self.hubs = {}
+
+    def changed(self, hub_name: str, modules: Modules) -> List[str]:
+        """前回 hub_name に送ったときから変わった（追加・削除を含む）モジュール名。初回は全モジュール。"""
+        sent = self.hubs.get(hub_name)
+        if sent is None:
+            return [name for name, _ in modules]
+        current = {name: module_digest(data) for name, data in modules}
+        return sorted(name for name in set(sent) | set(current) if sent.get(name) != current.get(name))
+
+    def record(self, hub_name: str, modules: Modules) -> None:
+        self.hubs[hub_name] = {name: module_digest(data) for name, data in modules}
+        self.save()
+
+    def forget(self, hub_name: str) -> None:
+        """次回は必ず送るようにする（Hub に別の program を入れた場合など）。"""
+        if self.hubs.pop(hub_name, None) is not None:
+            self.save()
+
+    def save(self) -> None:
+        try:
+            self.path.write_text(json.dumps(self.hubs, indent=2, ensure_ascii=False), encoding="utf-8")
+        except OSError as exc:
+            print(f"Warning: upload state not written ({exc})")
+
+
+def report_delta(hub_name: str, modules: Modules, changed: Sequence[str]) -> bool:
+    """
+    差分を表示し、送る必要があれば True を返す。
+    変わったモジュールがなければ、送らずに済んだバイト数を表示して False。
+    """
+    total = sum(len(data) for _, data in modules)
+    if not changed:
+        print(f"Upload skipped: no module changed since the last send to {hub_name!r} ({total} bytes saved)")
+        return False
+    sizes = dict(modules)
+    unchanged = total - sum(len(sizes.get(name, b"")) for name in changed)
+    print(f"Changed modules for {hub_name!r}: {', '.join(changed)}")
+    if unchanged:
+        print(f"  unchanged: {unchanged} bytes (the firmware replaces the whole program, so they are sent again)")
+    return True
+
+
+class FakeHub:
+    """
+    PybricksHubBLE の代わりに使う Hub。受け取った program を directory/<Hub 名>.bin に保存し、回数を数える。
+    BLE も Hub もない環境で、送信の流れ（--delta の省略、複数 Hub への並行送信など）を確かめるのに使う。
+    bytes_per_s を渡すと、その速さで送ったのと同じだけ待つ（BLE の転送時間の模擬）。
+    """
+
+    def __init__(self, directory: Path, name: str, bytes_per_s: Optional[float] = None):
+        self.directory = directory
+        self.name = name
+        self.bytes_per_s = bytes_per_s
+        self.connected = False
+        self.downloads = 0
+        self.started = 0
+
+    @property
+    def program_path(self) -> Path:
+        safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in self.name)
+        return self.directory / f"{safe}.bin"
+
+    async def connect(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.connected = True
+
+    async def download_user_program(self, program: bytes) -> None:
+        if not self.connected:
+            raise RuntimeError("fake hub is not connected")
+        if self.bytes_per_s:
+            await asyncio.sleep(len(program) / self.bytes_per_s)
+        self.program_path.write_bytes(program)
+        self.downloads += 1
+        print(f"Fake hub {self.name!r}: received {len(program)} bytes -> {self.program_path}")
+
+    async def start_user_program(self) -> None:
+        self.started += 1
+        print(f"Fake hub {self.name!r}: program started")
+
+    async def disconnect(self) -> None:
+        self.connected = False
@@ -3,36 +3,46 @@
 タイムアウトや計測など、制御まわりの共通処理を提供します。
 """
 
-from pybricks.tools import StopWatch, wait
+from pybricks.tools import StopWatch, multitask, wait
 
 
 async def run_with_timeout(start_fn, done_fn, stop_fn, timeout_ms, poll_ms=10):
     """
-    非同期ループで完了を監視し、タイムアウトで停止する共通関数。
+    動きとタイマーを multitask(race=True) で同時に待ち、先に終わった方で決める共通関数。
+    ループで完了を見に行かないので、完了の検出が poll_ms 分遅れることはない。
 
     Args:
-        start_fn: 非同期実行を開始する関数（wait=False で開始するなど）。
-        done_fn: 完了を True/False で返す関数。
+        start_fn: 動きを開始して、その awaitable を返す関数（motor.run_angle(200, 180) など。wait=False は付けない）。
+        done_fn: 完了を True/False で返す関数。start_fn が何も返さない（wait=False で開始した）ときだけ使う。
         stop_fn: タイムアウト時に呼ぶ停止関数。
         timeout_ms: タイムアウト（ミリ秒）。
-        poll_ms: ポーリング間隔（ミリ秒）。
+        poll_ms: done_fn を見る間隔（ミリ秒）。start_fn が何も返さないときだけ使う。
 
     Returns:
         bool: 正常完了で True、タイムアウトで False。
     """
-    start_fn()
-    timer = StopWatch()
-    timer.reset()
-
-    while timer.time() < timeout_ms:
-        if done_fn():
-            return True
-        await wait(poll_ms)
-
+    move = start_fn()
+    if move is None:
+        move = _wait_done(done_fn, poll_ms)
+    finished, _ = await multitask(_completed(move), wait(timeout_ms), race=True)
+    if finished:
+        return True
     stop_fn()
     return False
 
 
+async def _completed(move):
+    """move を待ち終えたら True を返す（race で負けたときは multitask が None を返す）。"""
+    await move
+    return True
+
+
+async def _wait_done(done_fn, poll_ms):
+    """wait=False で開始した動きを、done_fn が True になるまで待つ。"""
+    while not done_fn():
+        await wait(poll_ms)
+
+
 async def run_with_timing(label, coro_fn):
     """
     実行時間を計測しつつ非同期処理を実行する共通関数。
@@ -0,0 +1,139 @@
+"""
+PC側で使うファイル監視。build.py / selector.py の --watch から呼ばれる。Hub には送らない。
+runXX/ の .py を監視し、保存が落ち着いたら 1 回だけ再ビルド（と送信）を呼び出す。
+
+watchdog が入っていれば OS のファイル通知を使い、なければ mtime のポーリングに切り替える。
+"""
+
+import queue
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+POLL_INTERVAL_S = 0.5
+DEBOUNCE_S = 0.3
+
+Snapshot = Dict[Path, Tuple[int, int]]
+
+
+def snapshot(run_dirs: Iterable[Path]) -> Snapshot:
+    """監視対象の .py ごとの (mtime_ns, サイズ)。"""
+    files: Snapshot = {}
+    for run_dir in run_dirs:
+        for path in run_dir.glob("*.py"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+class PollingWatcher:
+    """一定間隔で mtime とサイズを比べる watcher（watchdog がない環境用）。"""
+
+    name = "polling"
+
+    def __init__(self, run_dirs: Iterable[Path], interval: float = POLL_INTERVAL_S):
+        self.run_dirs = list(run_dirs)
+        self.interval = interval
+        self.files = snapshot(self.run_dirs)
+
+    def changes(self, timeout: float) -> Set[Path]:
+        """timeout 秒以内に変わった（追加・削除を含む）ファイルを返す。なければ空集合。"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = snapshot(self.run_dirs)
+            changed = {path for path in set(current) | set(self.files) if current.get(path) != self.files.get(path)}
+            self.files = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def stop(self) -> None:
+        pass
+
+
+class WatchdogWatcher:
+    """watchdog の OS 通知で .py の変更を受け取る watcher。"""
+
+    name = "watchdog"
+
+    def __init__(self, run_dirs: Iterable[Path]):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        events: "queue.Queue[Path]" = queue.Queue()
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                for attr in ("src_path", "dest_path"):
+                    path = getattr(event, attr, None)
+                    if path and str(path).endswith(".py"):
+                        events.put(Path(path))
+
+        self.events = events
+        self.observer = Observer()
+        for run_dir in run_dirs:
+            self.observer.schedule(Handler(), str(run_dir), recursive=False)
+        self.observer.start()
+
+    def changes(self, timeout: float) -> Set[Path]:
+        changed: Set[Path] = set()
+        try:
+            changed.add(self.events.get(timeout=timeout))
+        except queue.Empty:
+            return changed
+        while True:
+            try:
+                changed.add(self.events.get_nowait())
+            except queue.Empty:
+                return changed
+
+    def stop(self) -> None:
+        self.observer.stop()
+        self.observer.join()
+
+
+def make_watcher(run_dirs: Iterable[Path], interval: float = POLL_INTERVAL_S):
+    """watchdog があれば WatchdogWatcher、なければ PollingWatcher を返す。"""
+    run_dirs = list(run_dirs)
+    try:
+        return WatchdogWatcher(run_dirs)
+    except ImportError:
+        return PollingWatcher(run_dirs, interval)
+
+
+def watch_runs(
+    run_dirs: Iterable[Path],
+    on_change: Callable[[Set[Path]], None],
+    debounce: float = DEBOUNCE_S,
+    interval: float = POLL_INTERVAL_S,
+    watcher=None,
+) -> None:
+    """
+    run_dirs を監視し、変更があれば on_change(変更ファイル) を呼ぶ。Ctrl+C で終了。
+    変更のあと debounce 秒間ほかの変更がなくなるまで待ち、その間の変更はまとめて 1 回で渡す。
+    """
+    run_dirs = sorted(run_dirs, key=lambda p: p.name)
+    if watcher is None:
+        watcher = make_watcher(run_dirs, interval)
+    print(f"Watching {', '.join(d.name for d in run_dirs)} ({watcher.name}). Ctrl+C to stop.")
+    try:
+        while True:
+            changed = watcher.changes(interval)
+            if not changed:
+                continue
+            while True:
+                more = watcher.changes(debounce)
+                if not more:
+                    break
+                changed |= more
+            on_change(changed)
+    except KeyboardInterrupt:
+        print("Watch stopped.")
+    finally:
+        watcher.stop()